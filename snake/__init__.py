@@ -0,0 +1,15 @@
+"""Snake: a headless engine, turtle front ends, bots and tools around them.
+
+Run ``python -m snake`` for the command-line modes (see snake.cli). Only the
+windowed modes (snake.single, snake.multi) import turtle and tkinter, so the
+engine, bots and tools load without a display, and the tests in tests/
+run headless (``python -m pytest``).
+"""
+import os
+import time
+
+STARTED = time.perf_counter()  # package import: the zero point of startup timings
+
+# Where the high score file, recordings and window icon live: the project
+# directory holding the package and the launcher scripts.
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
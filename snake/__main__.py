@@ -0,0 +1,6 @@
+"""``python -m snake``: see snake.cli."""
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,270 @@
+"""Computer-controlled snakes for the headless engine."""
+import math
+import random
+import time
+from array import array
+from collections import deque
+
+from .engine import DIRECTIONS, OPPOSITE
+from .stats import percentiles
+
+MOVES = ("up", "down", "left", "right")
+
+
+# Directions that don't reverse ``snake`` and lead to an empty cell inside the border.
+def safe_moves(game, snake):
+    grid = game.grid
+    hx, hy = snake.head
+    moves = []
+    for name in MOVES:
+        if name == OPPOSITE.get(snake.direction):
+            continue
+        dx, dy = DIRECTIONS[name]
+        i = grid.index((hx + dx, hy + dy))
+        if i is not None and not grid.cells[i]:
+            moves.append(name)
+    return moves
+
+
+class GreedyBot:
+    """Head straight for the food, never stepping into a wall or a body cell.
+
+    Looks only one cell ahead, so a choice costs the same on any board size.
+    Cells another snake's head can also reach this tick are avoided while
+    any other safe move is left (two greedy bots with mirrored starts would
+    otherwise meet head-on at the food every time). Ties are broken with
+    ``rng``. When every neighbour is blocked it keeps its direction.
+    """
+
+    # ``rng`` breaks ties between equally good moves (seed it for repeatable games).
+    def __init__(self, rng=None):
+        self.rng = rng or random.Random()
+
+    # Return the direction this bot wants ``snake`` to take this tick.
+    def choose(self, game, snake):
+        moves = safe_moves(game, snake)
+        if not moves:
+            return snake.direction
+        hx, hy = snake.head
+        if len(game.snakes) > 1:
+            contested = contested_cells(game, snake)
+            index = game.grid.index
+            calm = [name for name in moves
+                    if index((hx + DIRECTIONS[name][0], hy + DIRECTIONS[name][1])) not in contested]
+            moves = calm or moves
+        target = game.food if game.food is not None else snake.head
+
+        def dist(name):
+            dx, dy = DIRECTIONS[name]
+            return abs(hx + dx - target[0]) + abs(hy + dy - target[1])
+
+        best = min(dist(name) for name in moves)
+        return self.rng.choice([name for name in moves if dist(name) == best])
+
+
+class RandomBot:
+    """Wander: pick a random safe direction each tick (a baseline opponent)."""
+
+    # ``rng`` drives every choice (seed it for repeatable games).
+    def __init__(self, rng=None):
+        self.rng = rng or random.Random()
+
+    # Return the direction this bot wants ``snake`` to take this tick.
+    def choose(self, game, snake):
+        moves = safe_moves(game, snake)
+        return self.rng.choice(moves) if moves else snake.direction
+
+
+# Number of empty cells reachable from cell index ``i`` (``i`` included),
+# counting at most ``cap`` so the cost stays bounded on any board.
+def room(grid, i, cap):
+    cells, width, size = grid.cells, grid.width, grid.size
+    seen = {i}
+    stack = [i]
+    while stack and len(seen) < cap:
+        i = stack.pop()
+        x = i % width
+        for j in (i - width, i + width, i - 1 if x else -1, i + 1 if x + 1 < width else -1):
+            if 0 <= j < size and j not in seen and not cells[j]:
+                seen.add(j)
+                stack.append(j)
+    return len(seen)
+
+
+# Cell indices another snake's head can move into next tick (a head-to-head
+# crash if ``snake`` moves there too).
+def contested_cells(game, snake):
+    grid = game.grid
+    cells = set()
+    for other in game.snakes:
+        if other is not snake:
+            hx, hy = other.head
+            for dx, dy in (DIRECTIONS[name] for name in MOVES):
+                i = grid.index((hx + dx, hy + dy))
+                if i is not None:
+                    cells.add(i)
+    return cells
+
+
+class PathBot:
+    """Follow shortest paths to the food, falling back to the roomiest move.
+
+    Paths come from a breadth-first search rooted at the food over the grid's
+    empty cells. The distance field it builds is valid wherever the head goes,
+    so while the food stays put the bot walks down the field it already has,
+    checking only the next cell; a new search starts when the food moves or
+    the path ahead is blocked. A search runs for at most ``budget`` seconds
+    per tick and carries on from where it stopped on the next tick, so a
+    choice costs about the same on a 1000x1000 board as on the default one;
+    until the field reaches the head the bot uses the fallback. With
+    ``cells`` the search instead expands at most that many cells per tick,
+    so the bot's moves depend only on the game and not on machine load
+    (seeded headless matches replay exactly).
+
+    A move down the field is only taken if the cells reachable from it can
+    hold the body (a flood fill capped at the snake's length, at most
+    ``room_cap`` cells) and no other head can reach it on the same tick.
+    Otherwise the bot takes the safest move with the most room, nearest the
+    food on ties. Decision times are kept for the last ``window``
+    ticks (see ``latency``).
+    """
+
+    # ``rng`` breaks ties; ``budget`` is the search time per tick in seconds,
+    # or ``cells`` the number of cells a tick may search (replacing ``budget``).
+    def __init__(self, rng=None, budget=0.001, room_cap=512, window=256, clock=time.perf_counter, cells=None):
+        self.rng = rng or random.Random()
+        self.budget = budget  # seconds of search per tick
+        self.cells = cells  # cells searched per tick instead of the time budget (None: use the time)
+        self.room_cap = room_cap  # most cells a survival flood fill counts
+        self.clock = clock
+        self.searches = 0  # searches started
+        self.reused = 0  # ticks served by an earlier search
+        self.fallbacks = 0  # ticks decided by the survival fallback
+        self._grid = None  # grid the distance field belongs to
+        self._food = None  # food cell the field leads to
+        self._search_id = 0  # number of the current search
+        self._seen = array("I")  # per cell: number of the search that reached it
+        self._dist = array("I")  # per cell: steps to the food (valid where seen)
+        self._frontier = deque()  # cells whose neighbours are not searched yet
+        self._left = math.inf  # cells this tick may still search
+        self._latencies = deque(maxlen=window)  # seconds per decision
+
+    # Return the direction this bot wants ``snake`` to take this tick.
+    def choose(self, game, snake):
+        start = self.clock()
+        if self.cells:
+            self._left, deadline = self.cells, math.inf
+        else:
+            self._left, deadline = math.inf, start + self.budget
+        try:
+            return self._choose(game, snake, deadline)
+        finally:
+            self._latencies.append(self.clock() - start)
+
+    # Pick a move, searching until ``deadline`` at most.
+    def _choose(self, game, snake, deadline):
+        moves = safe_moves(game, snake)
+        if not moves:
+            return snake.direction
+        grid = game.grid
+        hx, hy = snake.head
+        head = grid.index(snake.head)
+        steps = {name: grid.index((hx + DIRECTIONS[name][0], hy + DIRECTIONS[name][1])) for name in moves}
+        need = min(len(snake.segments) + 2, self.room_cap)
+        contested = contested_cells(game, snake)
+        if game.food != self._food or grid is not self._grid:
+            self._restart(grid, game.food)
+        elif self._known(head) is not None:
+            self.reused += 1
+        for attempt in range(2):
+            self._search(grid, head, deadline)
+            here = self._known(head)
+            if here is None:
+                break  # search still under way
+            down = [name for name in moves if self._known(steps[name]) == here - 1]
+            self.rng.shuffle(down)
+            for name in down:
+                if steps[name] not in contested and room(grid, steps[name], need) >= need:
+                    return name
+            if down or attempt:
+                break  # the way to the food is a dead end
+            self._restart(grid, game.food)  # path blocked since the search: search again
+
+        # Survival fallback: no head-to-head risk, the most room, then the
+        # shortest known (or straight-line) distance to the food.
+        self.fallbacks += 1
+        target = game.food if game.food is not None else snake.head
+
+        def rank(name):
+            x, y = grid.cell(steps[name])
+            known = self._known(steps[name])
+            return (steps[name] in contested, -room(grid, steps[name], need),
+                    known if known is not None else abs(x - target[0]) + abs(y - target[1]))
+
+        best = min(rank(name) for name in moves)
+        return self.rng.choice([name for name in moves if rank(name) == best])
+
+    # Steps from cell index ``i`` to the food, or None if not searched yet.
+    def _known(self, i):
+        return self._dist[i] if self._seen[i] == self._search_id else None
+
+    # Start a new search from ``food`` (nothing to search while there is none).
+    # The per-cell arrays are allocated once per grid; a new search number
+    # makes every earlier entry stale without clearing them.
+    def _restart(self, grid, food):
+        if grid is not self._grid:
+            self._grid = grid
+            self._seen = array("I", bytes(4 * grid.size))
+            self._dist = array("I", bytes(4 * grid.size))
+        self._food = food
+        self._search_id += 1
+        self._frontier = deque()
+        if food is not None:
+            i = grid.index(food)
+            self._seen[i] = self._search_id
+            self._dist[i] = 0
+            self._frontier.append(i)
+            self.searches += 1
+
+    # Grow the distance field until it reaches cell ``head``, runs out of
+    # cells, has used up this tick's cells or ``deadline`` passes (the clock
+    # is read every 64 cells).
+    def _search(self, grid, head, deadline):
+        seen, dist, frontier, clock = self._seen, self._dist, self._frontier, self.clock
+        cells, width, size = grid.cells, grid.width, grid.size
+        search = self._search_id
+        left = self._left
+        expanded = 0
+        while frontier and seen[head] != search and expanded < left:
+            expanded += 1
+            if not expanded & 63 and clock() >= deadline:
+                break
+            i = frontier.popleft()
+            d = dist[i] + 1
+            x = i % width
+            for j in (i - width, i + width, i - 1 if x else -1, i + 1 if x + 1 < width else -1):
+                if 0 <= j < size and seen[j] != search and not cells[j]:
+                    seen[j] = search
+                    dist[j] = d
+                    frontier.append(j)
+        self._left = left - expanded
+
+    # Decision time over the recent window, in milliseconds:
+    # {"count", "mean", "p50", "p99", "max"} (zeros before the first choice).
+    def latency(self):
+        return percentiles(self._latencies, 1000.0)
+
+
+# Bot classes by the name player registries and tournaments use for them.
+BOTS = {"greedy": GreedyBot, "random": RandomBot, "path": PathBot}
+MATCH_CELLS = 1024  # cells a path bot searches per tick in headless matches
+
+
+# A bot by BOTS ``name`` driven by ``rng``. With ``cells`` a path bot
+# searches that many cells per tick instead of for a fixed time, so the same
+# seed always gives the same moves (headless matches); interactive games
+# keep the time budget.
+def make_bot(name, rng=None, cells=None):
+    if cells and BOTS[name] is PathBot:
+        return PathBot(rng, cells=cells)
+    return BOTS[name](rng)
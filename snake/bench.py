@@ -0,0 +1,336 @@
+"""Benchmarks for the engine and the renderers.
+
+Measures ticks per second and per-tick latency (p50/p99) while varying snake
+length (10 to 10,000 cells), the number of snakes and the board size. Snakes
+follow a cycle through every cell of the board, so they never die and long
+bodies stay long. Scenarios:
+
+  headless   snake.engine.Game only
+  render     Game plus the BodyView/Sprite drawing code on stub turtles
+             (renderer bookkeeping without Tk)
+  turtle     the same on real turtles, with ``--turtle`` (needs a display,
+             e.g. ``xvfb-run``)
+  canvas     the same on raw Tk canvas items (snake.canvas), with ``--turtle``
+             next to the turtle scenarios
+  snapshot   snake.snapshot.dumps plus restore of the game (one "tick" is
+             one save and load)
+  ai         one snake.ai.PathBot choosing every move (ticks include its
+             decisions; ``decide`` holds the decision latency alone)
+  vec        snake.vec.VecSnake boards (only when NumPy is installed)
+  startup    cold start of a fresh ``python -m snake`` process: to the end
+             of a one-tick headless match, and with ``--turtle`` to the
+             first frame of each game on screen (one "tick" is one run)
+
+Results are written as JSON; ``--compare BASELINE`` flags scenarios that got
+slower than a saved run by more than ``--threshold`` and exits with status 1.
+
+``--only PATTERN`` (repeatable) runs just the scenarios whose whole name
+matches one of the shell-style patterns, e.g. ``--only 'headless/*'``.
+
+Usage: python -m snake bench [--quick] [--only PATTERN] [--out bench.json] [--compare old.json]
+"""
+import argparse
+import fnmatch
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+from .engine import CELL, DIRECTIONS, Game, Snake
+from .render import BodyView, Sprite
+from .stats import percentiles
+
+TICKS = 2000  # ticks per scenario
+STARTUP_RUNS = 5  # processes started per startup scenario
+STARTUP_TARGET_MS = {"headless": 150, "single": 500, "multi": 500}  # cold start budgets
+
+
+# A cycle through every cell of the even-sized square inside the board of
+# half-width ``half`` (cells -half..half-1): along the bottom row, in rows
+# snaking up over the other columns, and back down the first column.
+def board_cycle(half):
+    n = 2 * half
+    path = [(x, 0) for x in range(n)]
+    for y in range(1, n):
+        xs = range(n - 1, 0, -1) if y % 2 else range(1, n)
+        path.extend((x, y) for x in xs)
+    path.extend((0, y) for y in range(n - 1, 0, -1))
+    return [(x - half, y - half) for x, y in path]
+
+
+# Map every cell of ``cycle`` to the direction name of the step to the next one.
+def cycle_directions(cycle):
+    names = {step: name for name, step in DIRECTIONS.items()}
+    turns = {}
+    for i, (x, y) in enumerate(cycle):
+        nx, ny = cycle[(i + 1) % len(cycle)]
+        turns[(x, y)] = names[(nx - x, ny - y)]
+    return turns
+
+
+# Smallest playfield (pixels) whose board holds ``players`` snakes of
+# ``length`` cells spread over the cycle with room to grow.
+def playfield_for(length, players, minimum=300):
+    half = max(2, math.ceil(math.sqrt(2 * length * players) / 2))
+    return max(minimum, half * CELL + CELL // 2)
+
+
+# Build a game with ``players`` snakes of ``length`` cells laid out along the
+# board cycle, moving along it. Returns (game, cycle directions).
+def make_game(length, players, playfield):
+    half = (playfield - CELL // 2) // CELL
+    cycle = board_cycle(half)
+    spacing = len(cycle) // players
+    if length >= spacing:
+        raise ValueError("{} snakes of {} cells do not fit a {} px board".format(players, length, playfield))
+    snakes = [Snake("S{}".format(p + 1), cycle[p * spacing + length - 1]) for p in range(players)]
+    game = Game(snakes, playfield=playfield, seed=1)
+    turns = cycle_directions(cycle)
+    grid = game.grid
+    for p, snake in enumerate(snakes):
+        head = p * spacing + length - 1
+        for k in range(head - 1, head - length, -1):
+            snake.segments.append(cycle[k])
+            grid.fill(grid.index(cycle[k]), snake.mark)
+        snake.direction = turns[cycle[head - 1]]
+    game.food = game.place_food()
+    return game, turns
+
+
+# Run ``tick()`` ``ticks`` times and return ticks/s and latency percentiles.
+def measure(tick, ticks):
+    clock = time.perf_counter
+    samples = []
+    started = clock()
+    for _ in range(ticks):
+        t = clock()
+        tick()
+        samples.append(clock() - t)
+    total = clock() - started
+    latency = percentiles(samples, 1e6)
+    return {"ticks": ticks,
+            "ticks_per_s": ticks / total,
+            "p50_us": latency["p50"],
+            "p99_us": latency["p99"]}
+
+
+# Ticks of the headless engine, snakes steered along the board cycle.
+def bench_headless(length, players, playfield, ticks):
+    game, turns = make_game(length, players, playfield)
+    snakes = game.snakes
+
+    def tick():
+        game.step({s.name: turns[s.head] for s in snakes})
+    result = measure(tick, ticks)
+    result["deaths"] = sum(s.resets for s in snakes)  # should stay 0
+    return result
+
+
+class StubTurtle:
+    """Stands in for a segment turtle: keeps its position, ignores styling."""
+
+    # Start at the origin.
+    def __init__(self):
+        self.pos = (0, 0)
+
+    # Remember the position the renderer moved the turtle to.
+    def goto(self, x, y=None):
+        self.pos = (x, y)
+
+    # Ignore styling calls.
+    def color(self, *args):
+        pass
+
+
+# Ticks plus drawing: every snake's BodyView and head Sprite synced each tick,
+# on stub turtles, or with ``screen`` on the segments of the ``renderer``
+# backend (see snake.render.RENDERERS) through its frames.
+def bench_render(length, players, playfield, ticks, screen=None, renderer="turtle"):
+    game, turns = make_game(length, players, playfield)
+    snakes = game.snakes
+    if screen is None:
+        make, paint, frame, touch = StubTurtle, StubTurtle.color, lambda draw: draw(), None
+    else:
+        from .render import make_backend
+        backend = make_backend(renderer, screen)
+        make, paint, frame, touch = backend.segment, backend.style, backend.renderer.frame, backend.renderer.touch
+
+    # Alternate two colors down the styled part of the tail, as a gradient would.
+    def style(seg, index):
+        paint(seg, "#000000" if index % 2 else "#202020")
+    views = [BodyView(s, lambda index: make(), style, styled=14, touch=touch) for s in snakes]
+    heads = [Sprite(make(), touch or (lambda t: None)) for _ in snakes]
+
+    def draw():
+        for view, head, snake in zip(views, heads, snakes):
+            view.sync()
+            head.place(snake.head)
+
+    def tick():
+        game.step({s.name: turns[s.head] for s in snakes})
+        frame(draw)
+    frame(draw)  # build the bodies before timing
+    return measure(tick, ticks)
+
+
+# Save and restore round trips of a game with ``players`` snakes of ``length`` cells.
+def bench_snapshot(length, players, playfield, ticks):
+    from . import snapshot
+    game, _ = make_game(length, players, playfield)
+    result = measure(lambda: snapshot.restore(game, snapshot.dumps(game)), ticks)
+    result["bytes"] = len(snapshot.dumps(game))
+    return result
+
+
+# Ticks of one PathBot-steered snake on a board of ``playfield`` pixels, with
+# the bot's own decision latency reported separately.
+def bench_bot(playfield, ticks):
+    from .ai import PathBot
+    snake = Snake("S1", (0, 0))
+    game = Game([snake], playfield=playfield, seed=1)
+    game.food = game.place_food()
+    bot = PathBot(random.Random(1), window=ticks)
+    result = measure(lambda: game.step({snake.name: bot.choose(game, snake)}), ticks)
+    result["decide"] = bot.latency()
+    result["food"] = snake.high_score // 10
+    return result
+
+
+# Ticks of ``envs`` VecSnake boards with one snake each taking random actions
+# (ticks/s counts board-ticks: steps times boards).
+def bench_vec(envs, ticks):
+    import numpy as np
+    from .vec import VecSnake
+    env = VecSnake(envs, seed=1)
+    rng = np.random.default_rng(1)
+    actions = rng.integers(0, 4, size=(ticks, envs))
+    step = iter(actions)
+    result = measure(lambda: env.step(next(step), observe=False), ticks)
+    result["ticks_per_s"] *= envs
+    return result
+
+
+# Wall time of ``runs`` fresh ``python -m snake`` processes run with ``args``
+# from the project directory, compared with the mode's startup target.
+def bench_startup(args, runs=STARTUP_RUNS):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    command = [sys.executable, "-m", "snake"] + args
+
+    def run():
+        subprocess.run(command, cwd=root, check=True, stdout=subprocess.DEVNULL)
+    result = measure(run, runs)
+    result["target_ms"] = STARTUP_TARGET_MS[args[0]]
+    result["within_target"] = result["p50_us"] <= result["target_ms"] * 1000
+    return result
+
+
+# Every scenario as (name, zero-argument function returning its result).
+def scenarios(ticks, quick=False, turtle_screen=None):
+    lengths = (10, 100, 1000) if quick else (10, 100, 1000, 10000)
+    counts = (1, 2, 8) if quick else (1, 2, 4, 8, 16)
+    boards = (300, 1000) if quick else (300, 1000, 3000, 10000)
+    found = []
+    for length in lengths:
+        found.append(("headless/length={}".format(length),
+                      lambda n=length: bench_headless(n, 1, playfield_for(n, 1), ticks)))
+    for count in counts:
+        found.append(("headless/players={}".format(count),
+                      lambda p=count: bench_headless(10, p, playfield_for(10, p), ticks)))
+    for board in boards:
+        found.append(("headless/playfield={}".format(board),
+                      lambda b=board: bench_headless(10, 2, b, ticks)))
+    for length in lengths:
+        found.append(("render/length={}".format(length),
+                      lambda n=length: bench_render(n, 1, playfield_for(n, 1), ticks)))
+    for length in lengths:
+        found.append(("snapshot/length={}".format(length),
+                      lambda n=length: bench_snapshot(n, 1, playfield_for(n, 1), ticks)))
+    for board in boards:
+        found.append(("ai/playfield={}".format(board), lambda b=board: bench_bot(b, ticks)))
+    if turtle_screen is not None:
+        for renderer in ("turtle", "canvas"):
+            for length in lengths:
+                found.append(("{}/length={}".format(renderer, length),
+                              lambda n=length, r=renderer: bench_render(n, 1, playfield_for(n, 1), ticks,
+                                                                         turtle_screen, r)))
+    found.append(("startup/headless", lambda: bench_startup(["headless", "--ticks", "1"])))
+    if turtle_screen is not None:
+        for mode in ("single", "multi"):
+            found.append(("startup/" + mode, lambda m=mode: bench_startup([m, "--first-frame"])))
+    try:
+        import numpy  # noqa: F401  (optional: only for the vec scenarios)
+    except ImportError:
+        pass
+    else:
+        for envs in (1, 256) if quick else (1, 256, 4096):
+            found.append(("vec/envs={}".format(envs), lambda e=envs: bench_vec(e, ticks)))
+    return found
+
+
+# Compare ``results`` with ``baseline`` (both {"results": {name: result}}) and
+# return the regressions: scenarios whose ticks/s fell, or whose p99 latency
+# rose, by more than ``threshold`` (a fraction).
+def compare(results, baseline, threshold):
+    regressions = []
+    old = baseline.get("results", {})
+    for name, new in results["results"].items():
+        if name not in old:
+            continue
+        speed = new["ticks_per_s"] / old[name]["ticks_per_s"] - 1
+        p99 = new["p99_us"] / old[name]["p99_us"] - 1 if old[name]["p99_us"] else 0.0
+        flag = speed < -threshold or p99 > threshold
+        print("{:<28} {:>+7.1%} ticks/s {:>+7.1%} p99{}".format(
+            name, speed, p99, "  REGRESSION" if flag else ""))
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+# Command-line entry point: run the scenarios, save and compare; returns the exit status.
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the snake engine and renderers.")
+    parser.add_argument("--ticks", type=int, default=TICKS, help="ticks per scenario")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes for a fast check")
+    parser.add_argument("--only", action="append", metavar="PATTERN",
+                        help="run only scenarios whose name matches this pattern, e.g. 'headless/*' (repeatable)")
+    parser.add_argument("--turtle", action="store_true",
+                        help="also time real turtle and canvas rendering (needs a display)")
+    parser.add_argument("--out", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against a saved results file")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before flagging (default 0.10)")
+    args = parser.parse_args(argv)
+
+    screen = None
+    if args.turtle:
+        import turtle
+        screen = turtle.Screen()
+        screen.tracer(0)
+
+    results = {"meta": {"python": platform.python_version(), "platform": platform.platform(),
+                        "ticks": args.ticks, "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+               "results": {}}
+    for name, run in scenarios(args.ticks, args.quick, screen):
+        if args.only and not any(fnmatch.fnmatchcase(name, pattern) for pattern in args.only):
+            continue
+        result = run()
+        results["results"][name] = result
+        print("{:<28} {:>12,.0f} ticks/s  p50 {:>8.1f} us  p99 {:>8.1f} us".format(
+            name, result["ticks_per_s"], result["p50_us"], result["p99_us"]), file=sys.stderr)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
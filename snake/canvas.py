@@ -0,0 +1,117 @@
+"""Raw Tk canvas rendering backend: snakes and food as plain canvas items.
+
+Every turtle method call goes through several layers of Python (vector
+math, shape transforms, screen bookkeeping) before it reaches Tk, and a
+moved turtle is redrawn with a polygon coords call plus an itemconfigure at
+the next frame. Here a segment is a single rectangle item (heads and food
+are ovals) created once and recycled through the segment pool: moving it is
+one ``coords`` call, recoloring it one ``itemconfigure`` (only when its fill
+actually changes), both sent straight to the Tcl interpreter. Tk repaints
+the moved items when the frame ends, so a frame has nothing else to push.
+
+The window, keyboard, timers, background and HUD text are still turtle's;
+only the board contents change backend. Play with it using
+``python -m snake multi --renderer canvas`` (or ``single``) and compare the
+two backends with
+``python -m snake bench --turtle --only 'turtle/*' --only 'canvas/*'``.
+"""
+from .engine import CELL
+from .render import OFFSCREEN, SEGMENT, FrameRenderer
+
+
+class CanvasItem:
+    """One canvas rectangle or oval standing in for a turtle (segment, head or food).
+
+    It has the turtle methods the drawing code uses: ``goto``, ``color``,
+    ``showturtle`` and ``hideturtle``.
+    Positions are turtle coordinates: turtle's canvas is centred on the
+    origin with y pointing down.
+    """
+
+    # Create the item on Tk canvas ``canvas``: an oval for ``shape`` "circle"
+    # and a rectangle otherwise, ``size`` pixels across and filled with ``color``.
+    def __init__(self, canvas, shape, size, color):
+        self.canvas = canvas  # Tk canvas holding the item
+        self.half = size / 2  # half the item's width in pixels
+        self.fill = color  # current fill
+        self.visible = True  # item state is "normal"
+        x, y = OFFSCREEN
+        h = self.half
+        create = canvas.create_oval if shape == "circle" else canvas.create_rectangle
+        self.item = create(x - h, -y - h, x + h, -y + h, fill=color, outline="")  # canvas item id
+        self._call = canvas.tk.call  # Tcl command call, skipping tkinter's argument wrapping
+        self._w = canvas._w  # Tcl name of the canvas widget
+
+    # Move the item so it is centred on pixel (x, y).
+    def goto(self, x, y=None):
+        if y is None:
+            x, y = x
+        h = self.half
+        self._call(self._w, "coords", self.item, x - h, -y - h, x + h, -y + h)
+
+    # Fill the item with ``color``.
+    def color(self, color):
+        if color != self.fill:
+            self.fill = color
+            self._call(self._w, "itemconfigure", self.item, "-fill", color)
+
+    # Show the item again.
+    def showturtle(self):
+        if not self.visible:
+            self.visible = True
+            self._call(self._w, "itemconfigure", self.item, "-state", "normal")
+
+    # Hide the item (it keeps its canvas item for reuse).
+    def hideturtle(self):
+        if not self.visible:
+            return
+        self.visible = False
+        self._call(self._w, "itemconfigure", self.item, "-state", "hidden")
+
+    # Remove the item from the canvas for good.
+    def delete(self):
+        self.canvas.delete(self.item)
+
+
+class CanvasRenderer(FrameRenderer):
+    """FrameRenderer for canvas items, which are already on the canvas once moved.
+
+    Nothing needs to be pushed at the end of a frame, so ``touch`` does not
+    keep track of anything; frames still let Tk repaint and are timed.
+    """
+
+    # Canvas items need no per-frame redraw.
+    def touch(self, t):
+        pass
+
+
+class CanvasBackend:
+    """Draws segments, heads and food as items on the turtle screen's Tk canvas.
+
+    Same interface as snake.render.TurtleBackend: ``renderer``, ``segment()``,
+    ``style(seg, color)``, ``sprite(shape, color, scale)`` and ``discard(seg)``.
+    """
+
+    # Draw on turtle screen ``wn``.
+    def __init__(self, wn):
+        self.wn = wn  # turtle screen owning the window
+        cv = wn.getcanvas()
+        self.canvas = getattr(cv, "_canvas", cv)  # turtle's ScrolledCanvas wraps the Tk canvas
+        self.renderer = CanvasRenderer(wn)  # times frames and lets Tk repaint
+
+    # A segment square with the default fill (colored with ``style``).
+    def segment(self):
+        return CanvasItem(self.canvas, "square", SEGMENT, "black")
+
+    # Fill segment ``seg`` with ``color`` (skipped when it already has it).
+    def style(self, seg, color):
+        seg.color(color)
+
+    # An item drawn as ``shape`` ("circle" or "square") in ``color``, at
+    # ``scale`` times the cell.
+    def sprite(self, shape, color, scale=1.0):
+        return CanvasItem(self.canvas, shape, CELL * scale, color)
+
+    # Remove a segment from the canvas for good.
+    def discard(self, seg):
+        seg.delete()
@@ -0,0 +1,92 @@
+"""Command-line entry point: ``python -m snake MODE [options]``.
+
+Modes (``python -m snake MODE --help`` for each one's options):
+
+  single      single-player game in a turtle window
+  multi       local multiplayer: two players, --ai, --stress, --board, --replay
+  headless    one bot match without a window, printed as JSON
+  bench       engine, renderer and startup benchmarks
+  tournament  many seeded bot matches over a process pool
+  replay      re-simulate a recording without a window
+  server      networked multiplayer server and load test
+
+A mode's module is imported only when that mode runs, so turtle and tkinter
+are loaded by the two windowed modes and nothing else.
+"""
+import importlib
+import json
+import sys
+import time
+
+# Mode name -> (module in this package, one-line description).
+MODES = {
+    "single": ("single", "single-player game"),
+    "multi": ("multi", "local multiplayer game"),
+    "headless": (None, "one bot match without a window"),
+    "bench": ("bench", "benchmarks"),
+    "tournament": ("tournament", "bot tournament"),
+    "replay": ("replay", "re-simulate a recording"),
+    "server": ("server", "multiplayer server"),
+}
+
+
+# Play one headless match between bots and print its result with the tick rate.
+def headless(argv=None):
+    import argparse
+    from .ai import BOTS
+    from .telemetry import Aggregator, JsonLinesSink, Telemetry
+    from .tournament import TICKS, play_match
+
+    parser = argparse.ArgumentParser(prog="python -m snake headless",
+                                     description="Play one bot match without a window.")
+    parser.add_argument("--bots", default="path,greedy",
+                        help="comma-separated line-up (choices: {})".format(", ".join(sorted(BOTS))))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ticks", type=int, default=TICKS)
+    parser.add_argument("--telemetry", metavar="FILE", help="stream the match's events to this JSON-lines file")
+    args = parser.parse_args(argv)
+    bots = args.bots.split(",")
+    unknown = [name for name in bots if name not in BOTS]
+    if unknown:
+        parser.error("unknown bot(s): {}".format(", ".join(unknown)))
+    telemetry = totals = None
+    if args.telemetry:
+        totals = Aggregator()
+        # Matches run far faster than real time: queue enough not to drop any.
+        telemetry = Telemetry([JsonLinesSink(args.telemetry), totals], size=1 << 20)
+    started = time.perf_counter()
+    result = play_match(args.seed, bots, args.ticks, telemetry)
+    elapsed = time.perf_counter() - started
+    result["ticks_per_s"] = args.ticks / elapsed if elapsed else 0.0
+    if telemetry is not None:
+        telemetry.close()
+        result["telemetry"] = totals.summary()
+        result["telemetry"]["dropped"] = telemetry.dropped
+    json.dump(result, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+# Print the modes.
+def usage(out):
+    print("usage: python -m snake MODE [options]\n\nmodes:", file=out)
+    for name, (_, about) in MODES.items():
+        print("  {:<12}{}".format(name, about), file=out)
+
+
+# Run the mode named by the first argument with the rest; returns the exit status.
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        usage(sys.stdout if argv else sys.stderr)
+        return 0 if argv else 2
+    mode, rest = argv[0], argv[1:]
+    if mode not in MODES:
+        print("unknown mode: {}\n".format(mode), file=sys.stderr)
+        usage(sys.stderr)
+        return 2
+    module = MODES[mode][0]
+    if module is None:
+        return headless(rest)
+    sys.argv[0] = "python -m snake " + mode  # argparse usage lines
+    return importlib.import_module("." + module, __package__).main(rest) or 0
@@ -0,0 +1,338 @@
+"""Headless snake simulation shared by the turtle front ends.
+
+All game state lives here as integer grid cells: a cell (cx, cy) is drawn at
+pixel (cx * CELL, cy * CELL). Nothing in this module imports turtle or tkinter,
+so games can be stepped thousands of times per second without a window and
+the front ends only render what ``Game.step`` reports.
+"""
+import random
+from array import array
+from collections import deque, namedtuple
+
+# Grid and timing constants (pixel sizes match the turtle front ends)
+CELL = 20
+PLAYFIELD = 300
+DELAY = 0.1
+FOOD_SCORE = 10  # points per food eaten
+
+# Unit vectors for each direction name; "stop" keeps the head in place.
+DIRECTIONS = {
+    "up": (0, 1),
+    "down": (0, -1),
+    "left": (-1, 0),
+    "right": (1, 0),
+    "stop": (0, 0),
+}
+OPPOSITE = {"up": "down", "down": "up", "left": "right", "right": "left"}
+# Directions as the small integer codes recordings and snapshots store.
+DIRECTION_CODES = ("up", "down", "left", "right", "stop")  # direction by code
+CODES = {name: code for code, name in enumerate(DIRECTION_CODES)}
+
+# One thing that happened during a tick.
+#   kind   -- "food", "high", "speed" or "death"
+#   player -- name of the snake involved (None for game-wide events)
+#   detail -- new food cell, new high score, new delay or death cause
+#             ("border", "self", "other" or "head")
+Event = namedtuple("Event", "kind player detail")
+
+
+# Convert a grid cell to turtle pixel coordinates.
+def to_pixels(cell):
+    return cell[0] * CELL, cell[1] * CELL
+
+
+# Start cells for ``count`` snakes: the centre for one, the two-player layout
+# for two, otherwise rows spread over the default board.
+def start_cells(count):
+    if count == 1:
+        return [(0, 0)]
+    if count == 2:
+        return [(-5, 0), (5, 0)]
+    starts = [(x, y) for y in range(-10, 11, 5) for x in range(-12, 13, 6)]
+    if count > len(starts):
+        raise ValueError("at most {} snakes fit on the board".format(len(starts)))
+    return starts[:count]
+
+
+class Grid:
+    """Flat occupancy array covering every cell inside the border.
+
+    All snakes in a game write their body cells here, tagged with their mark
+    (snake index + 1; 0 means empty), so border, self and other-snake tests
+    are each one bounds check and one array read. ``heads`` is scratch space
+    for spotting two heads on the same cell within a tick.
+
+    The grid also keeps an indexed set of empty cells: ``free[:free_count]``
+    holds every empty cell index in no particular order and ``slot[i]`` is
+    where cell ``i`` sits in ``free``. Filling or emptying a cell is a swap,
+    and a uniformly random empty cell is a single ``randrange``, however full
+    the board is.
+    """
+
+    # Create an empty grid for cells -half..half on both axes.
+    def __init__(self, half):
+        self.half = half  # last cell inside the border
+        self.width = 2 * half + 1  # cells per row
+        self.size = self.width * self.width  # number of cells
+        self.cells = array("H", bytes(2 * self.size))  # body owner mark per cell
+        self.heads = array("H", bytes(2 * self.size))  # head owner mark per cell
+        self.free = array("i", range(self.size))  # empty cells first, then filled ones
+        self.slot = array("i", range(self.size))  # position of each cell in free
+        self.free_count = self.size  # number of empty cells
+
+    # Flat index of a cell, or None if it lies outside the border.
+    def index(self, cell):
+        x, y = cell
+        h = self.half
+        if -h <= x <= h and -h <= y <= h:
+            return (y + h) * self.width + x + h
+        return None
+
+    # Cell for a flat index (inverse of ``index``).
+    def cell(self, index):
+        y, x = divmod(index, self.width)
+        return (x - self.half, y - self.half)
+
+    # Mark cell ``i`` as a body cell of the snake with ``mark``.
+    def fill(self, i, mark):
+        if not self.cells[i]:
+            self._take(i)
+        self.cells[i] = mark
+
+    # Mark cell ``i`` as empty again.
+    def empty(self, i):
+        if self.cells[i]:
+            self.cells[i] = 0
+            self._give(i)
+
+    # Move empty cell ``i`` out of the free region (swap with its last entry).
+    def _take(self, i):
+        free, slot = self.free, self.slot
+        last = self.free_count - 1
+        s, other = slot[i], free[last]
+        free[s], slot[other] = other, s
+        free[last], slot[i] = i, last
+        self.free_count = last
+
+    # Move cell ``i`` back into the free region (swap with its first filled entry).
+    def _give(self, i):
+        free, slot = self.free, self.slot
+        first = self.free_count
+        s, other = slot[i], free[first]
+        free[s], slot[other] = other, s
+        free[first], slot[i] = i, first
+        self.free_count = first + 1
+
+    # Uniformly random empty cell index, skipping the cells in ``exclude``, or
+    # None if there is none. Excluded cells are set aside for the draw only.
+    def random_free(self, rng, exclude=()):
+        held = []
+        for i in exclude:
+            if self.slot[i] < self.free_count:
+                self._take(i)
+                held.append(i)
+        pick = self.free[rng.randrange(self.free_count)] if self.free_count else None
+        for i in reversed(held):
+            self._give(i)
+        return pick
+
+
+class Snake:
+    """A snake on the grid: head cell, body cells, direction and score.
+
+    The body is a deque (nearest the head first) whose cells are also marked
+    in the game's shared Grid, so a move is one push at the front plus one pop
+    at the tail and a collision test is a single array lookup, whatever the
+    snake's length. A snake must be attached to a grid (Game does this) before
+    it moves.
+    """
+
+    # Create a snake resting at the start cell.
+    def __init__(self, name, start, direction="stop"):
+        self.name = name  # unique player name (used for high scores)
+        self.start = start  # (cx, cy) start cell
+        self.start_direction = direction  # direction restored on reset
+        self.head = start  # current head cell
+        self.direction = direction  # current direction name
+        self.segments = deque()  # body cells, nearest to the head first
+        self.grid = None  # shared occupancy grid (set by attach)
+        self.mark = 0  # value written into the grid for this snake's cells
+        self.score = 0  # current score
+        self.high_score = 0  # best score seen
+        self.moves = 0  # moves since the last reset (renderers diff against it)
+        self.resets = 0  # number of resets so far
+        self._grow = 0  # segments still to be added on the next moves
+
+    # Join a game's occupancy grid under the given mark.
+    def attach(self, grid, mark):
+        self.grid = grid
+        self.mark = mark
+
+    # Put the snake back at its start cell with an empty body and zero score.
+    def reset(self):
+        empty, index = self.grid.empty, self.grid.index
+        for cell in self.segments:
+            empty(index(cell))
+        self.head = self.start
+        self.direction = self.start_direction
+        self.segments.clear()
+        self.score = 0
+        self.moves = 0
+        self.resets += 1
+        self._grow = 0
+
+    # Change direction unless it would reverse the snake onto itself.
+    def turn(self, direction):
+        if direction not in DIRECTIONS:
+            raise ValueError("unknown direction: {!r}".format(direction))
+        if self.direction != OPPOSITE.get(direction):
+            self.direction = direction
+
+    # Schedule one extra segment; it appears at the old tail on the next move.
+    def grow(self):
+        self._grow += 1
+
+    # Advance one cell: the old head cell joins the body and the tail drops off
+    # unless growing. Body cells never repeat or overlap another snake (either
+    # would be a collision that resets the snake), so clearing the tail's grid
+    # cell never erases anyone else's mark.
+    def move(self):
+        if self.segments or self._grow:
+            grid = self.grid
+            self.segments.appendleft(self.head)
+            grid.fill(grid.index(self.head), self.mark)
+            if self._grow:
+                self._grow -= 1
+            else:
+                grid.empty(grid.index(self.segments.pop()))
+        dx, dy = DIRECTIONS[self.direction]
+        self.head = (self.head[0] + dx, self.head[1] + dy)
+        self.moves += 1
+
+    # True if the head overlaps one of the snake's own body cells.
+    def hits_self(self):
+        i = self.grid.index(self.head)
+        return i is not None and self.grid.cells[i] == self.mark
+
+    # Head followed by every body cell.
+    def cells(self):
+        return [self.head] + list(self.segments)
+
+
+class Game:
+    """Authoritative game state for one or more snakes sharing a food item.
+
+    The rule knobs default to the two-player game; the single-player game
+    speeds up by 0.001 per food down to 0.01 s and resets its speed on death.
+    """
+
+    # Create a game for the given snakes.
+    def __init__(self, snakes, playfield=PLAYFIELD, food=(0, 5), delay=DELAY,
+                 delay_step=0.002, min_delay=0.02, reset_delay_on_death=False,
+                 seed=None, rng=None):
+        self.snakes = list(snakes)  # snakes in update order
+        self.by_name = {s.name: s for s in self.snakes}  # lookup for inputs
+        self.playfield = playfield  # half-width of the board in pixels
+        self.half = (playfield - CELL // 2) // CELL  # last cell inside the border
+        self.grid = Grid(self.half)  # body occupancy shared by every snake
+        for mark, snake in enumerate(self.snakes, 1):
+            snake.attach(self.grid, mark)
+        self.food = food  # current food cell (None while the board is full)
+        self.start_delay = delay  # delay restored on death if enabled
+        self.delay = delay  # seconds between ticks
+        self.delay_step = delay_step  # delay decrease per food
+        self.min_delay = min_delay  # delay floor
+        self.reset_delay_on_death = reset_delay_on_death
+        self.rng = rng if rng is not None else random.Random(seed)  # food placement
+        self.tick = 0  # number of completed steps
+
+    # True if a cell lies inside the playfield border.
+    def in_bounds(self, cell):
+        return abs(cell[0]) <= self.half and abs(cell[1]) <= self.half
+
+    # Pick a uniformly random cell that no snake's head or body covers, or
+    # None if the board is full (placement is retried every tick).
+    def place_food(self):
+        index = self.grid.index
+        heads = [i for i in (index(s.head) for s in self.snakes) if i is not None]
+        i = self.grid.random_free(self.rng, heads)
+        return None if i is None else self.grid.cell(i)
+
+    # Reset a snake after a collision and record why it died.
+    def _kill(self, snake, cause, events):
+        snake.reset()
+        if self.reset_delay_on_death:
+            self.delay = self.start_delay
+        events.append(Event("death", snake.name, cause))
+
+    # Apply inputs, advance one tick and return the list of events.
+    #
+    # ``inputs`` maps snake names to direction names; snakes without an entry
+    # keep their current direction.
+    def step(self, inputs=None):
+        events = []
+        if inputs:
+            for name, direction in inputs.items():
+                self.by_name[name].turn(direction)
+
+        if self.food is None:
+            self.food = self.place_food()
+
+        # Food is eaten before moving, exactly as the turtle games did.
+        for snake in self.snakes:
+            if snake.head == self.food:
+                self.food = self.place_food()
+                snake.grow()
+                snake.score += FOOD_SCORE
+                events.append(Event("food", snake.name, self.food))
+                if snake.score > snake.high_score:
+                    snake.high_score = snake.score
+                    events.append(Event("high", snake.name, snake.high_score))
+                self.delay = max(self.min_delay, self.delay - self.delay_step)
+                events.append(Event("speed", None, self.delay))
+
+        for snake in self.snakes:
+            snake.move()
+        self._collide(events)
+
+        self.tick += 1
+        return events
+
+    # Reset every snake that collided after this tick's moves, appending a
+    # death event for each.
+    #
+    # All collisions in one pass over the snakes, in player order: border,
+    # self and other-snake tests read the shared grid (a snake reset earlier
+    # in the pass no longer blocks the ones after it), then the surviving
+    # head is marked so a second head on the same cell is a head-to-head
+    # crash. Cost is linear in the number of snakes.
+    def _collide(self, events):
+        grid = self.grid
+        cells, heads, index = grid.cells, grid.heads, grid.index
+        marked = []  # head cells written this tick, cleared below
+        crashed = []  # snakes in a head-to-head collision
+        for snake in self.snakes:
+            i = index(snake.head)
+            if i is None:
+                self._kill(snake, "border", events)
+                i = index(snake.head)
+            elif cells[i] == snake.mark:
+                self._kill(snake, "self", events)
+                i = index(snake.head)
+            elif cells[i]:
+                self._kill(snake, "other", events)
+                i = index(snake.head)
+            if i is None:
+                continue
+            if heads[i]:
+                first = self.snakes[heads[i] - 1]
+                if first not in crashed:
+                    crashed.append(first)
+                crashed.append(snake)
+            else:
+                heads[i] = snake.mark
+                marked.append(i)
+        for i in marked:
+            heads[i] = 0
+        for snake in sorted(crashed, key=lambda s: s.mark):
+            self._kill(snake, "head", events)
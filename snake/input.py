@@ -0,0 +1,66 @@
+"""Per-player key buffering: at most one turn per tick, none lost or reversed."""
+import time
+from collections import deque
+
+from .engine import OPPOSITE
+from .stats import percentiles
+
+
+class InputQueue:
+    """Bounded buffer of one player's direction presses, drained once per tick.
+
+    Key handlers call ``press``; the tick calls ``drain`` and passes the
+    result to the engine. Only one turn is applied per tick, and each is
+    checked against the direction the snake actually has, not the last key
+    pressed. So "up, left" pressed within one tick while moving right turns
+    twice over two ticks instead of reversing into the body, and the second
+    press is not lost either.
+
+    The delay from each applied press to the tick that moves with it is kept
+    for the last ``window`` presses (see ``latency``).
+    """
+
+    # Buffer presses for ``snake``; ``size`` presses at most, newer ones are dropped.
+    def __init__(self, snake, size=3, window=256, clock=time.perf_counter):
+        self.snake = snake  # engine snake whose direction the presses change
+        self.size = size  # most buffered presses
+        self.clock = clock  # timestamps for latency
+        self.presses = 0  # presses received
+        self.applied = 0  # presses turned into a turn
+        self.dropped = 0  # presses lost because the buffer was full
+        self.rejected = 0  # presses that would reverse or repeat the direction
+        self._queue = deque()  # (direction, press time), oldest first
+        self._latencies = deque(maxlen=window)  # seconds from press to move
+
+    # Buffer a direction press (from a key handler). It is checked against
+    # the direction the snake will have when it comes up: the last buffered
+    # press, or the current direction.
+    def press(self, direction):
+        self.presses += 1
+        last = self._queue[-1][0] if self._queue else self.snake.direction
+        if direction == last or direction == OPPOSITE.get(last):  # no change, or a reversal
+            self.rejected += 1
+        elif len(self._queue) >= self.size:
+            self.dropped += 1
+        else:
+            self._queue.append((direction, self.clock()))
+
+    # Return the direction to apply this tick, or None: the oldest buffered
+    # press that neither repeats nor reverses the current direction (presses
+    # that do are discarded).
+    def drain(self):
+        current = self.snake.direction
+        while self._queue:
+            direction, pressed = self._queue.popleft()
+            if direction == current or direction == OPPOSITE.get(current):
+                self.rejected += 1
+                continue
+            self.applied += 1
+            self._latencies.append(self.clock() - pressed)
+            return direction
+        return None
+
+    # Press-to-move latency over the recent window, in milliseconds:
+    # {"count", "mean", "p50", "p99", "max"} (zeros before the first turn).
+    def latency(self):
+        return percentiles(self._latencies, 1000.0)
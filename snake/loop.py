@@ -0,0 +1,101 @@
+"""Fixed-timestep game loop: simulation rate independent of render rate."""
+import time
+
+
+class FixedStep:
+    """Run simulation ticks at a fixed rate from a monotonic clock.
+
+    Each call to ``advance`` (one frame) adds the real time elapsed since the
+    previous frame to an accumulator and runs one tick per ``interval()``
+    seconds in it, then renders once. Time spent inside a tick therefore
+    never adds drift. If the game falls behind, at most ``max_catch_up``
+    ticks run in one frame and the rest of the backlog is dropped (and
+    counted) rather than making the game race to catch up.
+
+    Pausing and holding (e.g. the short freeze after a death) stop the
+    simulation without blocking: frames keep rendering and input keeps
+    flowing while no ticks run.
+
+    Tick lengths shorter than ``min_interval`` (including zero or negative
+    ones) are clamped to it, so a game that keeps speeding up never stalls
+    the loop.
+    """
+
+    # ``step()`` runs one tick, ``render()`` draws one frame and ``interval()``
+    # returns the current tick length in seconds (it may change between ticks).
+    def __init__(self, step, render, interval, max_catch_up=5, clock=time.monotonic, min_interval=0.001):
+        self.step = step  # simulation tick callback
+        self.render = render  # frame callback
+        self._interval = interval  # current seconds per tick, as given
+        self.min_interval = min_interval  # shortest tick allowed
+        self.max_catch_up = max_catch_up  # most ticks run in one frame
+        self.clock = clock  # monotonic time source
+        self.paused = False  # no ticks while True
+        self.ticks = 0  # ticks run so far
+        self.dropped = 0  # ticks skipped because the game fell too far behind
+        self._last = None  # clock reading at the previous frame
+        self._acc = 0.0  # simulated time owed
+        self._hold_until = None  # clock reading at which a hold ends
+
+    # Current tick length in seconds, never below ``min_interval``.
+    def interval(self):
+        return max(self.min_interval, self._interval())
+
+    # Stop ticking for ``seconds`` without blocking frames or input.
+    def hold(self, seconds):
+        self._hold_until = self.clock() + seconds
+
+    # True while ticks are suspended by pause or hold.
+    def idle(self):
+        return self.paused or self._hold_until is not None
+
+    # Pause or resume; resuming never replays the time spent paused.
+    def toggle_pause(self):
+        self.paused = not self.paused
+
+    # Run the ticks that are due, render one frame and return the number of
+    # seconds until the next tick is due (a good delay before calling again).
+    def advance(self):
+        now = self.clock()
+        elapsed = 0.0 if self._last is None else now - self._last
+        self._last = now
+        if self._hold_until is not None and now >= self._hold_until:
+            elapsed = min(elapsed, now - self._hold_until)  # never replay the hold
+            self._hold_until = None
+        if self.idle():
+            self._acc = 0.0
+            self.render()
+            if self._hold_until is not None:
+                return min(self._hold_until - now, self.interval())
+            return self.interval()
+
+        self._acc += elapsed
+        interval = self.interval()
+        ran = 0
+        while self._acc >= interval and not self.idle():
+            if ran == self.max_catch_up:
+                behind = int(self._acc // interval)
+                self.dropped += behind
+                self._acc -= behind * interval
+                break
+            self.step()
+            self.ticks += 1
+            ran += 1
+            self._acc -= interval
+            interval = self.interval()
+        if self.idle():
+            self._acc = 0.0
+        self.render()
+        return max(0.0, self.interval() - self._acc)
+
+    # Tick counters as a dict (for overlays and logging).
+    def stats(self):
+        return {"ticks": self.ticks, "dropped": self.dropped}
+
+    # Drive the loop from turtle's timer: call ``advance`` now and reschedule
+    # it on screen ``wn`` whenever the next tick is due.
+    def run_on(self, wn):
+        def frame():
+            wait = self.advance()
+            wn.ontimer(frame, max(1, int(wait * 1000)))
+        frame()
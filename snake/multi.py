@@ -0,0 +1,433 @@
+"""Local multiplayer snake: two players, bots, stress mode, big boards and replays."""
+import colorsys
+import json
+import os
+import random
+import tkinter as tk
+import turtle
+
+from . import DATA_DIR
+from .ai import BOTS
+from .engine import CELL, DELAY, PLAYFIELD, Game, Snake, start_cells
+from .input import InputQueue
+from .loop import FixedStep
+from .profile import profiler_from_env
+from .render import (RENDERERS, BoardView, BodyView, Hud, SegmentPool, Sprite, gradient, make_backend,
+                     report_first_frame, report_render, set_background)
+from .replay import Recorder, Replay, recording_path
+from .scores import HIGH_SCORE_FILE, HighScoreStore
+from .telemetry import telemetry_from_env
+
+# Player registry: one entry per snake. "start" is a grid cell (20 px per cell),
+# "rgb" the base color, and either "controls" (up/down/left/right keys) for a
+# local player or "ai" (a snake.ai.BOTS name) for a computer-controlled one.
+PLAYERS = [
+    {"name": "P1", "start": (-5, 0), "rgb": (30, 30, 30),
+     "controls": {"up": "w", "down": "s", "left": "a", "right": "d"}},
+    {"name": "P2", "start": (5, 0), "rgb": (30, 144, 255),
+     "controls": {"up": "i", "down": "k", "left": "j", "right": "l"}},
+]
+
+
+# Load a player registry (a JSON list shaped like PLAYERS) from a file.
+def load_players(path):
+    with open(path, "r", encoding="utf-8") as f:
+        players = json.load(f)
+    for entry in players:
+        entry["start"] = tuple(entry["start"])
+        entry["rgb"] = tuple(entry.get("rgb", (30, 30, 30)))
+    return players
+
+
+# Build a registry of ``count`` AI snakes spread over the board (stress mode).
+def stress_players(count, bot="greedy"):
+    starts = start_cells(count)
+    players = []
+    for i in range(count):
+        r, g, b = colorsys.hsv_to_rgb(i / count, 0.8, 1.0)
+        players.append({"name": "AI{}".format(i + 1), "start": starts[i],
+                        "rgb": (int(r * 255), int(g * 255), int(b * 255)), "ai": bot})
+    return players
+
+
+# Build a registry for the snakes of a recording: known players keep their
+# colors, others get evenly spaced hues. Nobody has controls during a replay.
+def replay_players(replay):
+    known = {entry["name"]: entry for entry in PLAYERS}
+    snakes = replay.settings["snakes"]
+    players = []
+    for i, entry in enumerate(snakes):
+        r, g, b = colorsys.hsv_to_rgb(i / len(snakes), 0.8, 1.0)
+        rgb = known[entry["name"]]["rgb"] if entry["name"] in known else (int(r * 255), int(g * 255), int(b * 255))
+        players.append({"name": entry["name"], "start": tuple(entry["start"]), "rgb": rgb})
+    return players
+
+
+# Try to set a window icon from nearby files: prefer .ico, fallback to .png.
+def set_window_icon(wn):
+    # Determine candidate icon files in the project directory
+    base_dir = DATA_DIR
+    ico_path = os.path.join(base_dir, "snake_icon.ico")
+    png_path = os.path.join(base_dir, "snake_icon.png")
+    try:
+        # Access the underlying Tk root
+        root = wn.getcanvas().winfo_toplevel()
+        # Try .ico first (Windows-friendly)
+        if os.path.exists(ico_path):
+            try:
+                root.iconbitmap(ico_path)
+                return True
+            except Exception:
+                pass
+        # Try PNG via PhotoImage (works on many platforms)
+        if os.path.exists(png_path):
+            try:
+                img = tk.PhotoImage(file=png_path)
+                root.iconphoto(False, img)
+                # keep a reference to prevent garbage collection
+                wn._icon_img = img
+                return True
+            except Exception:
+                pass
+    except Exception:
+        pass
+    return False
+
+
+class Player:
+    """Render one engine snake: head, tail segments (turtles or canvas items) and controls."""
+
+    # Initialize a player renderer for an engine snake with a base RGB color, key
+    # controls (None for a bot), the shared segment pool, the rendering
+    # backend (snake.render.TurtleBackend or snake.canvas.CanvasBackend) and
+    # an optional bot. With body=False only the head is drawn here (a
+    # BoardView draws the bodies).
+    def __init__(self, snake, base_rgb, controls, pool, backend, bot=None, body=True):
+        self.snake = snake  # engine state this player draws
+        self.pool = pool  # shared segment turtle pool
+        self.name = snake.name  # player name
+        self.base_rgb = base_rgb  # tuple (r,g,b) base color
+        self.controls = controls  # dict of control keys
+        self.bot = bot  # computer controller, or None for a local player
+        self.inputs = InputQueue(snake) if controls else None  # buffered key presses
+        # Segment color per tail index, computed once; the gradient stops
+        # changing after 13 segments, so the last one colors the rest.
+        self.styles = gradient(base_rgb)
+        self.backend = backend  # recolors segments
+        touch = backend.renderer.touch  # marks changed turtles for the next frame
+
+        # Create the round head in the base color scaled to 220.
+        self.head = backend.sprite("circle", "#{:02x}{:02x}{:02x}".format(*self._rgb(220)))
+        self.head_sprite = Sprite(self.head, touch)  # moves the head only when its cell changes
+        self.head_sprite.place(snake.head)  # move to starting position
+
+        # Tail segment turtles; only the first len(styles) ever need restyling.
+        self.body = None
+        if body:
+            self.body = BodyView(snake, self._new_segment, self._style_segment, styled=len(self.styles),
+                                 release_segment=pool.release, touch=touch)
+
+    # Convert base RGB and a scale into a color tuple.
+    def _rgb(self, scale):
+        r = min(255, int(self.base_rgb[0] * scale / 255))  # scale red channel
+        g = min(255, int(self.base_rgb[1] * scale / 255))  # scale green channel
+        b = min(255, int(self.base_rgb[2] * scale / 255))  # scale blue channel
+        return (r, g, b)  # return RGB tuple
+
+    # Color ("#rrggbb") of the segment at ``index`` in the tail.
+    def segment_color(self, index):
+        return self.styles[min(index, len(self.styles) - 1)]
+
+    # Take a segment from the pool and give it the color for its index.
+    def _new_segment(self, index):
+        seg = self.pool.acquire()  # reused hidden segment or a new one
+        self.backend.style(seg, self.segment_color(index))
+        return seg
+
+    # Recolor a segment that moved to a new index in the tail (nothing is
+    # sent to Tk when its color stays the same).
+    def _style_segment(self, seg, index):
+        self.backend.style(seg, self.segment_color(index))
+
+    # Move the head turtle and the changed segment turtles to the snake's cells.
+    def render(self):
+        if self.body is not None:
+            self.body.sync()
+        self.head_sprite.place(self.snake.head)
+
+
+# Draw the playfield border and a faint grid to improve visual comfort
+# (rendered once into a cached background image rather than with a turtle).
+def draw_background(wn):
+    set_background(wn, PLAYFIELD, "#b6e3b6",
+                   grid=(20, "#2e8b57"),  # faint grid every 20 px
+                   border=(3, "#0b6623"))  # square border around the playfield
+
+
+# Draw just the border of a board too large for a background image.
+def draw_border(wn, playfield):
+    pen = turtle.Turtle()
+    pen.hideturtle()
+    pen.speed(0)
+    pen.color("#0b6623")
+    pen.pensize(3)
+    pen.penup()
+    pen.goto(-playfield, -playfield)
+    pen.pendown()
+    for x, y in ((playfield, -playfield), (playfield, playfield), (-playfield, playfield), (-playfield, -playfield)):
+        pen.goto(x, y)
+
+
+# Set up screen, players, controls and run the game loop via ontimer.
+# ``registry`` is a list of player entries (see PLAYERS). With ``replay`` (a
+# snake.replay.Replay) the recorded game is drawn instead, ``speed`` times as
+# fast as it was played. ``board`` (cells across) plays on a larger board seen
+# through a window that follows the first player. With ``first_frame`` the
+# game stops after drawing its first frame (used to time startup).
+# ``renderer`` names the backend drawing the snakes and food (see
+# snake.render.RENDERERS): "turtle", or "canvas" for raw Tk canvas items.
+def play(registry=PLAYERS, replay=None, speed=1.0, board=None, first_frame=False, renderer="turtle"):
+    if speed <= 0:
+        raise ValueError("speed must be positive, not {}".format(speed))
+    # High scores are kept in memory and written in batches off the game loop.
+    highs = HighScoreStore(HIGH_SCORE_FILE)
+
+    wn = turtle.Screen()
+    wn.title("Snake Game - Two Players")
+    wn.bgcolor("#b6e3b6")
+    wn.setup(width=600, height=600)
+    wn.tracer(0)
+
+    # Attempt to set a custom window icon (place snake_icon.ico or snake_icon.png
+    # next to this script). This is optional; function silently fails if absent.
+    try:
+        set_window_icon(wn)
+    except Exception:
+        pass
+
+    # Boards larger than the window get a camera that follows the first player
+    # and only draw the body cells in view.
+    if replay is not None:
+        playfield = replay.game.playfield
+    elif board:
+        playfield = board // 2 * CELL + CELL // 2
+    else:
+        playfield = PLAYFIELD
+    big = playfield > PLAYFIELD
+
+    turtle.colormode(255)  # allow 0-255 RGB color values
+    if big:
+        draw_border(wn, playfield)
+    else:
+        draw_background(wn)  # draw static border and grid
+
+    # Snakes and food are turtles or canvas items depending on the backend;
+    # frames only redraw what changed (and are timed).
+    backend = make_backend(renderer, wn)
+    frames = backend.renderer
+
+    # Food setup
+    food = backend.sprite("circle", "#e63946", 0.9)
+    food_sprite = Sprite(food, frames.touch)
+
+    # Engine state: a new seeded game that is recorded to snake_replays/
+    # (except for startup timing runs), or the game rebuilt from a recording.
+    recorder = None
+    if replay is None:
+        seed = random.randrange(2 ** 32)
+        game = Game([Snake(entry["name"], tuple(entry["start"])) for entry in registry],
+                    playfield=playfield, delay=DELAY, seed=seed)
+        for snake in game.snakes:  # stored highs first, so the recording starts from them
+            snake.high_score = highs.get(snake.name)
+        if not first_frame:
+            recorder = Recorder(recording_path("multi"), game, seed)
+    else:
+        game = replay.game
+        registry = replay_players(replay)
+
+    # One renderer per registry entry; segments are recycled between all
+    # players instead of leaking on reset.
+    pool = SegmentPool(backend.segment, discard=backend.discard)
+    players = []
+    for snake, entry in zip(game.snakes, registry):
+        bot = BOTS[entry["ai"]]() if entry.get("ai") else None
+        players.append(Player(snake, base_rgb=entry["rgb"], controls=entry.get("controls"),
+                              pool=pool, backend=backend, bot=bot, body=not big))
+
+    # On a big board one culled view draws every body; tails are one color each.
+    board_view = None
+    if big:
+        def new_tile(mark):
+            seg = pool.acquire()
+            backend.style(seg, players[mark - 1].styles[-1])
+            return seg
+        board_view = BoardView(wn, game, 600 // (2 * CELL) + 1, new_tile, pool.release, frames.touch)
+
+    # Pen used for score display
+    pen = turtle.Turtle()
+    pen.speed(0)
+    pen.hideturtle()
+    pen.penup()
+    pen.goto(0, 260)
+
+    # Score text for every player: two per line, or four per line in a smaller
+    # font when there are more than two players.
+    per_line, size = (2, 16) if len(players) <= 2 else (4, 10)
+    hud = Hud(pen, font=("Courier", size, "bold"), color="#05386b")
+    shown = []  # scores last put in the title bar (big boards)
+
+    # Update the on-screen score display (rewritten only when a value changed).
+    def update_display():
+        scores = [f"{p.name}: {p.snake.score} (High {p.snake.high_score})" for p in players]
+        lines = ["    ".join(scores[i:i + per_line]) for i in range(0, len(scores), per_line)]
+        if board_view is None:
+            hud.show("\n".join(lines))
+        elif scores != shown:  # the window scrolls, so big boards use the title bar
+            shown[:] = scores
+            wn.title("Snake - " + "  ".join(scores))
+
+    # Draw the current state: food, snakes and score text.
+    def draw():
+        if board_view is not None:
+            board_view.follow(players[0].snake.head)
+            board_view.sync()
+        food_sprite.place(game.food)  # None only while the board is full
+        for player in players:
+            player.render()
+        update_display()
+
+    wn.listen()
+
+    # Return a function that queues a turn for a player's snake; the tick
+    # applies one per move and drops presses that would reverse it.
+    def make_dir_setter(player, dir_name):
+        def set_dir():
+            player.inputs.press(dir_name)
+        return set_dir
+
+    # Register keyboard handlers for every local player.
+    for player in players:
+        for dir_name, key in (player.controls or {}).items():
+            wn.onkeypress(make_dir_setter(player, dir_name), key)
+
+    bots = [p for p in players if p.bot]  # players steered by the computer
+    keyboard = [p for p in players if p.inputs]  # players steered from the keyboard
+    bot_names = {p.name for p in bots}  # bots' scores are not saved as high scores
+
+    # Collect this tick's turns: bot choices and at most one queued key press per player.
+    def read_inputs():
+        inputs = {p.name: p.bot.choose(game, p.snake) for p in bots}
+        for player in keyboard:
+            turn = player.inputs.drain()
+            if turn:
+                inputs[player.name] = turn
+        return inputs
+
+    # Opt-in profiling (SNAKE_PROFILE=1, or a .csv/.json trace path): per-phase
+    # frame timings with a p50/p99 overlay; when off, nothing is wrapped.
+    profiler, trace_path = profiler_from_env()
+    profiler.instrument(game)
+    read_inputs = profiler.wrap("input", read_inputs)
+    # Opt-in telemetry (SNAKE_TELEMETRY=events.jsonl), written off the game loop.
+    telemetry, totals = telemetry_from_env()
+    if replay is not None:
+        step = replay.step
+    else:
+        step = recorder.step if recorder is not None else game.step
+    simulate = profiler.wrap("simulate", telemetry.wrap_step(game, step))
+    record_high = profiler.wrap("persist", highs.update)
+    if profiler.enabled:
+        stats_pen = turtle.Turtle()
+        stats_pen.hideturtle()
+        stats_pen.penup()
+        stats_pen.goto(0, -290)
+        profiler.show_on(Hud(stats_pen, font=("Courier", 9, "normal"), color="#05386b"))
+
+    # One simulation tick: bots choose, the engine steps, new highs are saved.
+    # A replay applies the recorded directions instead and saves nothing.
+    def tick():
+        if replay is not None:
+            if not replay.done():
+                simulate()
+            return
+        events = simulate(read_inputs())  # advance the simulation one tick (and record it)
+
+        # Record new high scores of local players (written to disk later).
+        for event in events:
+            if event.kind == "high" and event.player not in bot_names:  # local player beat their high score
+                record_high(event.player, event.detail)
+
+    # Ticks run every game.delay seconds on a monotonic clock, independent of
+    # how long a frame takes; each frame draws only what changed.
+    loop = FixedStep(tick, profiler.wrap("render", lambda: frames.frame(draw, budget=game.delay / speed)),
+                     lambda: game.delay / speed)
+    loop.advance = profiler.wrap_frame(loop.advance)  # one frame: due ticks plus drawing
+
+    # Start the repeating game loop via ontimer; save scores when the window closes.
+    loop.run_on(wn)
+    try:
+        if first_frame:
+            report_first_frame(wn)  # startup timing only: stop after one frame
+        else:
+            wn.mainloop()
+    finally:
+        highs.close()
+        if recorder is not None:
+            recorder.close()
+        if trace_path:
+            profiler.dump(trace_path)
+        telemetry.close()
+        if not first_frame:
+            report_render(frames, pool=pool.stats(), loop=loop.stats())
+        if totals is not None:
+            print(json.dumps(totals.summary()))
+        for player in bots:
+            if hasattr(player.bot, "latency"):
+                lat = player.bot.latency()
+                print("{} decisions: p50 {:.2f} ms, p99 {:.2f} ms, max {:.2f} ms".format(
+                    player.name, lat["p50"], lat["p99"], lat["max"]))
+
+
+# Command-line entry point: pick the players (or a recording) and play.
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local multiplayer snake.")
+    parser.add_argument("--players", help="JSON file with a player registry (see PLAYERS)")
+    parser.add_argument("--stress", type=int, metavar="N", help="run N AI snakes instead")
+    parser.add_argument("--board", type=int, metavar="CELLS",
+                        help="play on a CELLS x CELLS board with a scrolling view (odd, at least 11, e.g. 1001)")
+    parser.add_argument("--ai", metavar="BOT", choices=sorted(BOTS),
+                        help="computer-controlled P2, or the bot --stress uses ({})".format(", ".join(sorted(BOTS))))
+    parser.add_argument("--replay", metavar="FILE", help="play back a recording from snake_replays/")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed factor")
+    parser.add_argument("--start", type=int, default=0, metavar="TICK", help="start the replay at this tick")
+    parser.add_argument("--first-frame", action="store_true", help="exit after the first frame (startup timing)")
+    parser.add_argument("--renderer", choices=RENDERERS, default="turtle",
+                        help="draw the snakes with turtles or straight onto the Tk canvas (default turtle)")
+    args = parser.parse_args(argv)
+    if args.speed <= 0:
+        parser.error("--speed must be positive")
+    if args.board is not None and (args.board < 11 or args.board % 2 == 0):
+        parser.error("--board must be an odd number of cells, at least 11")
+    options = {"first_frame": args.first_frame, "renderer": args.renderer}
+    if args.replay:
+        try:
+            replay = Replay(args.replay)
+        except (OSError, ValueError) as exc:
+            parser.error(str(exc))
+        replay.seek(args.start)
+        play(replay=replay, speed=args.speed, **options)
+    elif args.stress:
+        play(stress_players(args.stress, args.ai or "greedy"), board=args.board, **options)
+    elif args.players:
+        play(load_players(args.players), board=args.board, **options)
+    elif args.ai:
+        play([PLAYERS[0], {"name": "P2", "start": PLAYERS[1]["start"], "rgb": PLAYERS[1]["rgb"], "ai": args.ai}],
+             board=args.board, **options)
+    else:
+        play(board=args.board, **options)
+
+
+if __name__ == "__main__":
+    main()
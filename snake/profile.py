@@ -0,0 +1,143 @@
+"""Opt-in frame profiler: per-phase timings, percentiles and trace dumps.
+
+Phases are timed by wrapping the functions that make them up (``wrap``), and
+frames by wrapping the function that runs one frame (``wrap_frame``). A
+disabled profiler returns the functions unchanged, so when profiling is off
+the games run exactly the code they would run without it.
+
+Turn it on with the SNAKE_PROFILE environment variable: ``1`` shows the
+overlay, a path ending in .csv or .json also writes the trace there on exit.
+"""
+import json
+import os
+import time
+from array import array
+
+from .stats import percentiles
+
+PHASES = ("input", "simulate", "collide", "render", "persist")
+COLUMNS = PHASES + ("frame",)  # per-frame values kept in the ring buffer
+
+
+class Profiler:
+    """Per-phase times of the last ``size`` frames in a fixed-size ring buffer.
+
+    Phase times are exclusive: a phase nested in another (collisions inside
+    the simulation step) is not counted twice. ``frame`` is the wall time of
+    the whole frame, so it also covers time outside every phase.
+    """
+
+    # Keep ``size`` frames; a disabled profiler wraps nothing and records nothing.
+    def __init__(self, enabled=True, size=600, clock=time.perf_counter):
+        self.enabled = enabled
+        self.size = size  # frames kept
+        self.clock = clock
+        self.frames = 0  # frames recorded so far
+        self._ring = array("d", bytes(8 * size * len(COLUMNS)))  # ms, one row per frame
+        self._current = [0.0] * len(PHASES)  # seconds per phase in the frame in progress
+        self._nested = 0.0  # time spent in inner phases of the running one
+        self._overlay = None  # (hud, every) set by show_on
+
+    # Return ``fn`` timed as part of ``phase`` (``fn`` itself when disabled).
+    def wrap(self, phase, fn):
+        if not self.enabled:
+            return fn
+        index = PHASES.index(phase)
+        current, clock = self._current, self.clock
+
+        def timed(*args, **kwargs):
+            start = clock()
+            outer, self._nested = self._nested, 0.0
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                current[index] += elapsed - self._nested
+                self._nested = outer + elapsed
+        return timed
+
+    # Return ``fn`` (which runs one whole frame) timed as a frame: its phase
+    # times are committed to the ring buffer when it returns.
+    def wrap_frame(self, fn):
+        if not self.enabled:
+            return fn
+        clock = self.clock
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._commit(clock() - start)
+        return timed
+
+    # Time ``game``'s collision pass (snake.engine.Game) as the collide phase.
+    def instrument(self, game):
+        if self.enabled:
+            game._collide = self.wrap("collide", game._collide)
+
+    # Store the finished frame's times and start a new frame.
+    def _commit(self, elapsed):
+        width = len(COLUMNS)
+        row = (self.frames % self.size) * width
+        ring, current = self._ring, self._current
+        for i, seconds in enumerate(current):
+            ring[row + i] = seconds * 1000.0
+            current[i] = 0.0
+        ring[row + width - 1] = elapsed * 1000.0
+        self._nested = 0.0
+        self.frames += 1
+        if self._overlay is not None and self.frames % self._overlay[1] == 0:
+            self._overlay[0].show(self.overlay_text())
+
+    # Recorded rows, oldest first, as lists of ms per column.
+    def rows(self):
+        width, count = len(COLUMNS), min(self.frames, self.size)
+        first = self.frames - count
+        return [list(self._ring[(f % self.size) * width:(f % self.size + 1) * width])
+                for f in range(first, self.frames)]
+
+    # {column: {"p50", "p99", "max"}} in ms over the recorded frames.
+    def percentiles(self):
+        rows = self.rows()
+        result = {}
+        for i, column in enumerate(COLUMNS):
+            summary = percentiles(row[i] for row in rows)
+            result[column] = {"p50": summary["p50"], "p99": summary["p99"], "max": summary["max"]}
+        return result
+
+    # One-line summary for the overlay.
+    def overlay_text(self):
+        p = self.percentiles()
+        parts = ["frame p50 {:.1f} p99 {:.1f} ms".format(p["frame"]["p50"], p["frame"]["p99"])]
+        parts += ["{} {:.2f}".format(phase[:3], p[phase]["p99"]) for phase in PHASES]
+        return "  ".join(parts)
+
+    # Show the summary with ``hud`` (a snake.render.Hud) every ``every`` frames.
+    def show_on(self, hud, every=30):
+        if self.enabled:
+            self._overlay = (hud, every)
+
+    # Write the recorded frames to ``path``: CSV (one row per frame) if it
+    # ends in .csv, otherwise JSON with the rows and the percentiles.
+    def dump(self, path):
+        header = ["{}_ms".format(column) for column in COLUMNS]
+        rows = self.rows()
+        with open(path, "w", encoding="utf-8") as f:
+            if path.endswith(".csv"):
+                f.write(",".join(["index"] + header) + "\n")
+                first = self.frames - len(rows)
+                for n, row in enumerate(rows, first):
+                    f.write(",".join([str(n)] + ["{:.4f}".format(v) for v in row]) + "\n")
+            else:
+                json.dump({"columns": header, "frames": rows,
+                           "percentiles": self.percentiles()}, f)
+
+
+# Profiler configured by SNAKE_PROFILE (disabled when unset) and the trace
+# path to dump to on exit (None unless SNAKE_PROFILE names a file).
+def profiler_from_env():
+    setting = os.environ.get("SNAKE_PROFILE", "")
+    enabled = setting not in ("", "0")
+    path = setting if setting.endswith((".csv", ".json")) else None
+    return Profiler(enabled=enabled), path
@@ -0,0 +1,578 @@
+"""Turtle drawing helpers shared by the snake front ends."""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import deque
+
+from . import STARTED
+from .engine import CELL, to_pixels
+
+# Where hidden turtles are parked.
+OFFSCREEN = (1000, 1000)
+
+# Rendered backgrounds are cached here as PNG files named after their spec.
+BACKGROUND_CACHE = os.path.join(tempfile.gettempdir(), "snake_backgrounds")
+
+
+# Draw the static playfield into a new Tk PhotoImage, one ``put`` per rectangle.
+#   playfield -- half-width of the play area in pixels
+#   bg        -- color of the whole image
+#   checker   -- optional (tile, color1, color2) checkerboard over the play area
+#   grid      -- optional (gap, color) 1 px grid lines inside the play area
+#   border    -- optional (width, color) frame centered on the play area edge
+# The image is centered on the turtle origin; turtle y grows upwards.
+def render_background(playfield, bg, checker=None, grid=None, border=None):
+    import tkinter as tk
+
+    pad = (border[0] + 1) // 2 if border else 0  # room for half the border outside
+    side = 2 * (playfield + pad)
+    img = tk.PhotoImage(width=side, height=side)
+
+    def col(x):  # turtle x -> image column
+        return x + playfield + pad
+
+    def row(y):  # turtle y -> image row
+        return playfield + pad - y
+
+    img.put(bg, to=(0, 0, side, side))
+    if checker:
+        tile, color1, color2 = checker
+        for j, y in enumerate(range(-playfield, playfield, tile)):
+            for i, x in enumerate(range(-playfield, playfield, tile)):
+                color = color1 if (i + j) % 2 == 0 else color2
+                img.put(color, to=(col(x), row(y + tile), col(x + tile), row(y)))
+    if grid:
+        gap, color = grid
+        for v in range(-playfield + gap, playfield, gap):
+            img.put(color, to=(col(v), row(playfield), col(v) + 1, row(-playfield)))
+            img.put(color, to=(col(-playfield), row(v), col(playfield), row(v) + 1))
+    if border:
+        width, color = border
+        lo, hi = col(-playfield) - width // 2, col(playfield) - width // 2 + width
+        img.put(color, to=(lo, lo, hi, lo + width))  # top
+        img.put(color, to=(lo, hi - width, hi, hi))  # bottom
+        img.put(color, to=(lo, lo, lo + width, hi))  # left
+        img.put(color, to=(hi - width, lo, hi, hi))  # right
+    return img
+
+
+# Show the static playfield as the screen's single background picture.
+#
+# The image is rendered once and cached as a PNG keyed by every argument, so
+# later runs only load a file; it replaces hundreds of turtle-drawn canvas
+# items with the one image item turtle already keeps for ``bgpic``. If the
+# cache cannot be written the image is placed on the canvas directly.
+def set_background(wn, playfield, bg, checker=None, grid=None, border=None):
+    spec = repr((playfield, bg, checker, grid, border))
+    name = hashlib.sha1(spec.encode("utf-8")).hexdigest()[:16] + ".png"
+    path = os.path.join(BACKGROUND_CACHE, name)
+    wn.bgcolor(bg)
+    if not os.path.exists(path):
+        img = render_background(playfield, bg, checker, grid, border)
+        try:
+            os.makedirs(BACKGROUND_CACHE, exist_ok=True)
+            img.write(path + ".tmp", format="png")
+            os.replace(path + ".tmp", path)
+        except Exception:
+            canvas = wn.getcanvas()
+            canvas.tag_lower(canvas.create_image(0, 0, image=img))
+            wn._background_img = img  # keep a reference to prevent garbage collection
+            return None
+    wn.bgpic(path)
+    return path
+
+
+# Remove a turtle and its canvas items from its screen for good (best-effort:
+# turtle has no public API for this, so we undo what RawTurtle.__init__ did).
+def _discard(seg):
+    try:
+        screen = seg.getscreen()
+        screen._turtles.remove(seg)
+        for item in seg.items:
+            screen._delete(item)
+        shape_item = seg.turtle._item
+        for item in shape_item if isinstance(shape_item, list) else [shape_item]:
+            screen._delete(item)
+        seg._hidden_from_screen = True  # a pending FrameRenderer flush must skip it
+    except Exception:
+        pass
+
+
+# Push ``turtles`` to the canvas of screen ``wn`` the way Screen.update()
+# pushes every turtle. turtle has no public API for this either, so it uses
+# the same internals as Screen.update(); if they are missing it falls back to
+# a full ``wn.update()``.
+def _redraw(wn, turtles):
+    try:
+        tracing = wn._tracing
+        draws = [(t._update_data, t._drawturtle) for t in turtles]
+    except AttributeError:
+        wn.update()
+        return
+    wn._tracing = True  # what Screen.update() does, for these turtles only
+    try:
+        for update_data, draw in draws:
+            update_data()
+            draw()
+    finally:
+        wn._tracing = tracing
+
+
+# Tail gradient for a snake of color ``base_rgb`` as "#rrggbb" strings: entry
+# i colors segment i and the last entry every segment after it. The base
+# color is scaled by first/255 next to the head and brightens by ``step``
+# per segment until it reaches full scale.
+def gradient(base_rgb, first=180, step=6, top=255):
+    colors = []
+    for i in range(-(-(top - first) // step) + 1):
+        scale = first + min(top - first, i * step)
+        colors.append("#{:02x}{:02x}{:02x}".format(*(min(255, int(c * scale / 255)) for c in base_rgb)))
+    return colors
+
+
+SEGMENT = 18  # side of a tail segment square in pixels
+
+
+# Name of the plain ``size`` px square polygon shape, registered on
+# ``screen`` on first use. Every segment turtle gets it once and is then
+# only recolored: switching a turtle between compound shapes would delete
+# and recreate its canvas item, a color change reuses it.
+def square_shape(screen, size=SEGMENT):
+    name = "square{}".format(size)
+    if name not in screen.getshapes():
+        h = size / 2
+        screen.register_shape(name, ((-h, -h), (-h, h), (h, h), (h, -h)))
+    return name
+
+
+class SegmentPool:
+    """Reusable segment turtles, so growing after a reset creates no new canvas items.
+
+    Released turtles are hidden and kept for the next ``acquire``; at most
+    ``max_free`` are kept and any beyond that are removed from the screen.
+    The counters report turtles ever ``allocated``, acquires served by
+    ``reuse``, turtles currently ``live`` and turtles ``discarded``.
+    """
+
+    # ``make()`` creates a new segment turtle when the pool is empty and
+    # ``discard(turtle)`` removes one for good.
+    def __init__(self, make, max_free=512, discard=_discard):
+        self.make = make  # factory for new turtles
+        self.max_free = max_free  # cap on hidden turtles kept for reuse
+        self.discard = discard  # removes a turtle the pool has no room for
+        self._free = []  # hidden turtles ready for reuse
+        self.allocated = 0  # turtles created so far
+        self.reused = 0  # acquires served from the free list
+        self.live = 0  # turtles handed out and not yet released
+        self.discarded = 0  # released turtles dropped because the pool was full
+
+    # Hand out a visible segment turtle, reusing a hidden one when possible.
+    def acquire(self):
+        if self._free:
+            seg = self._free.pop()
+            seg.showturtle()
+            self.reused += 1
+        else:
+            seg = self.make()
+            self.allocated += 1
+        self.live += 1
+        return seg
+
+    # Take a segment turtle back: hide it and keep it for reuse if there is room.
+    def release(self, seg):
+        self.live -= 1
+        seg.hideturtle()
+        if len(self._free) < self.max_free:
+            seg.goto(*OFFSCREEN)
+            self._free.append(seg)
+        else:
+            self.discard(seg)
+            self.discarded += 1
+
+    # Counters as a dict (for overlays and logging).
+    def stats(self):
+        return {
+            "allocated": self.allocated,
+            "reused": self.reused,
+            "live": self.live,
+            "free": len(self._free),
+            "discarded": self.discarded,
+        }
+
+
+class BodyView:
+    """Segment turtles mirroring an engine snake's body, nearest the head first.
+
+    A normal tick touches a single turtle: the tail turtle is moved to the cell
+    just behind the head (or a fresh turtle is made there when the snake grew).
+    Only a reset, or more skipped moves than the body is long, redraws it all.
+    """
+
+    # Track ``snake``; ``make_segment(index)`` returns a new segment turtle,
+    # ``release_segment(turtle)`` takes back one that is no longer needed
+    # (default: park it off-screen) and ``style_segment(turtle, index)``
+    # restyles one whose index changed. ``styled`` is how many leading indices
+    # have their own style; every index from there on looks the same
+    # (0 = the whole body looks the same). ``touch(turtle)`` is told about
+    # every turtle that changed, e.g. FrameRenderer.touch.
+    def __init__(self, snake, make_segment, style_segment=None, styled=0,
+                 release_segment=None, touch=None):
+        self.snake = snake  # engine snake being drawn
+        self.make_segment = make_segment  # factory for new segment turtles
+        self.release_segment = release_segment or (lambda seg: seg.goto(*OFFSCREEN))
+        self.touch = touch or (lambda seg: None)  # dirty-turtle callback
+        self.style_segment = style_segment  # per-index styling callback
+        self.styled = styled if style_segment else 0  # leading indices to restyle
+        self.turtles = deque()  # segment turtles, nearest the head first
+        self._moves = snake.moves  # snake.moves at the last sync
+        self._resets = None  # snake.resets at the last sync (None: first sync draws the whole body)
+
+    # Release every segment turtle and forget them.
+    def clear(self):
+        for seg in self.turtles:
+            self.release_segment(seg)
+            self.touch(seg)
+        self.turtles.clear()
+
+    # Bring the turtles in line with the snake's body.
+    def sync(self):
+        snake = self.snake
+        body = snake.segments
+        fresh = snake.moves - self._moves  # new cells at the front of the body
+        touch = self.touch
+        if snake.resets != self._resets or fresh < 0 or fresh > len(body):
+            self._redraw()
+        elif fresh:
+            recycled = fresh - (len(body) - len(self.turtles))  # tail turtles to reuse
+            for i in range(fresh - 1, -1, -1):
+                if recycled > 0:
+                    seg = self.turtles.pop()
+                    recycled -= 1
+                else:
+                    seg = self.make_segment(len(self.turtles))
+                seg.goto(*to_pixels(body[i]))
+                touch(seg)
+                self.turtles.appendleft(seg)
+            # Every turtle shifted index; only the leading styled ones look different.
+            if self.styled:
+                for i in range(min(self.styled + fresh, len(self.turtles))):
+                    self.style_segment(self.turtles[i], i)
+                    touch(self.turtles[i])
+        self._moves = snake.moves
+        self._resets = snake.resets
+
+    # Place every turtle from scratch (after a reset or a long gap between syncs).
+    def _redraw(self):
+        body = self.snake.segments
+        while len(self.turtles) > len(body):
+            seg = self.turtles.pop()
+            self.release_segment(seg)
+            self.touch(seg)
+        while len(self.turtles) < len(body):
+            self.turtles.append(self.make_segment(len(self.turtles)))
+        for seg, cell in zip(self.turtles, body):
+            seg.goto(*to_pixels(cell))
+            self.touch(seg)
+
+
+class Sprite:
+    """A single turtle drawn at a grid cell (a head or the food).
+
+    ``place`` only moves the turtle, and reports it to ``touch``, when the
+    cell actually changed.
+    """
+
+    # Wrap ``turtle``; ``touch(turtle)`` is told when it moves.
+    def __init__(self, turtle, touch=None):
+        self.turtle = turtle  # the turtle being positioned
+        self.touch = touch or (lambda t: None)  # dirty-turtle callback
+        self.cell = None  # cell the turtle was last moved to
+
+    # Move the turtle to ``cell`` unless it is already there (None = leave it).
+    def place(self, cell):
+        if cell is None or cell == self.cell:
+            return False
+        self.cell = cell
+        self.turtle.goto(*to_pixels(cell))
+        self.touch(self.turtle)
+        return True
+
+
+class BoardView:
+    """Body cells of every snake on a board too large to draw whole.
+
+    The turtle canvas is sized to the whole board and scrolled so the camera
+    cell stays centred (``follow``); turtles keep their board coordinates, so
+    scrolling moves nothing. ``sync`` gives a segment turtle only to the body
+    cells within ``radius`` cells of the camera and gives back the turtles of
+    cells that emptied or scrolled out of view. It reads the
+    (2 * radius + 1) ** 2 grid cells around the camera and never walks a
+    body, so a frame costs the same on any board size and for any snake
+    length. Each snake's tail is drawn in one color (no gradient).
+    """
+
+    # Show ``game``'s bodies on screen ``wn``; ``make_segment(mark)`` returns a
+    # turtle styled for the snake with that grid mark and ``release_segment``
+    # takes one back (e.g. SegmentPool.acquire plus a color, and release).
+    def __init__(self, wn, game, radius, make_segment, release_segment, touch=None):
+        self.wn = wn  # turtle screen being scrolled
+        self.grid = game.grid  # occupancy read every frame
+        self.radius = radius  # cells drawn around the camera
+        self.make_segment = make_segment
+        self.release_segment = release_segment
+        self.touch = touch or (lambda seg: None)  # dirty-turtle callback
+        self.camera = (0, 0)  # cell kept in the middle of the window
+        self.tiles = {}  # grid index -> (turtle, mark) for the drawn cells
+        side = (2 * game.half + 3) * CELL
+        wn.screensize(side, side)  # scroll region: the board plus its border
+
+    # Centre the window on ``cell``.
+    def follow(self, cell):
+        self.camera = cell
+        cv = self.wn.getcanvas()
+        canvas = getattr(cv, "_canvas", cv)  # turtle's ScrolledCanvas wraps the Tk canvas
+        x, y = to_pixels(cell)
+        w, h = cv.canvwidth, cv.canvheight
+        # Re-applied every frame: resizing the window re-centres turtle's canvas.
+        canvas.xview_moveto((x - canvas.winfo_width() / 2 + w / 2) / w)
+        canvas.yview_moveto((-y - canvas.winfo_height() / 2 + h / 2) / h)
+
+    # Draw the body cells around the camera and recycle the rest.
+    def sync(self):
+        grid = self.grid
+        cells, half, r = grid.cells, grid.half, self.radius
+        cx, cy = self.camera
+        x0, x1 = max(-half, cx - r), min(half, cx + r)
+        seen = {}  # grid index -> mark of every body cell in view
+        for y in range(max(-half, cy - r), min(half, cy + r) + 1):
+            base = grid.index((x0, y))
+            for dx, mark in enumerate(cells[base:base + x1 - x0 + 1]):
+                if mark:
+                    seen[base + dx] = mark
+        tiles, touch = self.tiles, self.touch
+        for i in [i for i, (_, mark) in tiles.items() if seen.get(i) != mark]:
+            seg = tiles.pop(i)[0]
+            self.release_segment(seg)
+            touch(seg)
+        for i, mark in seen.items():
+            if i not in tiles:
+                seg = self.make_segment(mark)
+                seg.goto(*to_pixels(grid.cell(i)))
+                touch(seg)
+                tiles[i] = (seg, mark)
+
+
+class Hud:
+    """One line (or block) of HUD text that is only rewritten when it changes."""
+
+    # Write with ``pen`` in ``font``; the pen should already be positioned.
+    def __init__(self, pen, font, align="center", color=None):
+        self.pen = pen  # hidden turtle that owns the text item
+        self.font = font  # (family, size, style)
+        self.align = align  # text alignment around the pen position
+        self.color = color  # text color, or None to keep the pen's
+        self.text = None  # text currently on screen
+
+    # Show ``text``; returns False (and touches nothing) if it is already shown.
+    def show(self, text):
+        if text == self.text:
+            return False
+        self.text = text
+        self.pen.clear()
+        if self.color:
+            self.pen.color(self.color)
+        self.pen.write(text, align=self.align, font=self.font)
+        return True
+
+
+class FrameRenderer:
+    """Pushes only the turtles that changed since the last frame to the canvas.
+
+    With ``tracer(0)``, turtle's ``Screen.update()`` redraws every turtle on
+    the screen (hidden pool turtles included) each frame. Drawing code here
+    reports the turtles it moved through ``touch``; ``frame`` redraws just
+    those and lets Tk repaint the damaged regions. Each frame is timed, and
+    frames slower than the budget (normally the tick delay) are counted.
+    """
+
+    # Render onto turtle screen ``wn``.
+    def __init__(self, wn):
+        self.wn = wn  # turtle screen being drawn on
+        self._dirty = {}  # turtles touched since the last frame (dict keeps order)
+        self._full = True  # next frame redraws every turtle (first frame)
+        self.frames = 0  # frames rendered
+        self.last_ms = 0.0  # duration of the latest frame
+        self.avg_ms = 0.0  # moving average of frame durations
+        self.worst_ms = 0.0  # slowest frame so far
+        self.over_budget = 0  # frames slower than their budget
+
+    # Mark a turtle as needing a redraw this frame.
+    def touch(self, t):
+        self._dirty[t] = None
+
+    # Run ``draw()`` (which touches what it changes), push the touched turtles
+    # to the canvas and let Tk repaint and process input. ``budget`` is the
+    # time in seconds the frame may take; returns the frame time in ms.
+    def frame(self, draw=None, budget=None):
+        start = time.perf_counter()
+        if draw is not None:
+            draw()
+        wn = self.wn
+        if self._full:
+            self._full = False
+            self._dirty.clear()
+            wn.update()
+        else:
+            if self._dirty:
+                _redraw(wn, self._dirty)
+                self._dirty.clear()
+            wn.getcanvas().update()
+        elapsed = (time.perf_counter() - start) * 1000
+        self.frames += 1
+        self.last_ms = elapsed
+        self.avg_ms += (elapsed - self.avg_ms) / min(self.frames, 60)
+        self.worst_ms = max(self.worst_ms, elapsed)
+        if budget is not None and elapsed > budget * 1000:
+            self.over_budget += 1
+        return elapsed
+
+    # Frame timing counters as a dict (for overlays and logging).
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "last_ms": self.last_ms,
+            "avg_ms": self.avg_ms,
+            "worst_ms": self.worst_ms,
+            "over_budget": self.over_budget,
+        }
+
+
+class TurtleBackend:
+    """Draws segments, heads and food as turtles (the default renderer).
+
+    A rendering backend hands the front ends what they draw the snakes and
+    the food with: ``renderer`` (a FrameRenderer), ``segment()`` making a
+    square pool segment, ``style(seg, color)`` recoloring one (a no-op when
+    the color is unchanged), ``sprite(shape, color, scale)`` making a head or
+    food, and ``discard(seg)`` removing a segment for good.
+    snake.canvas.CanvasBackend is the raw Tk canvas counterpart.
+    """
+
+    # Draw on turtle screen ``wn``.
+    def __init__(self, wn):
+        self.wn = wn  # turtle screen being drawn on
+        self.renderer = FrameRenderer(wn)  # pushes the changed turtles each frame
+        self.square = square_shape(wn)  # shape every segment turtle shares
+        self.discard = _discard
+
+    # A plain turtle that moves without drawing.
+    def _turtle(self):
+        import turtle
+
+        t = turtle.Turtle()
+        t.speed(0)  # instant animation
+        t.penup()  # don't draw when moving
+        return t
+
+    # A segment turtle with the shared square shape (colored with ``style``).
+    def segment(self):
+        seg = self._turtle()
+        seg.shape(self.square)
+        return seg
+
+    # Color segment ``seg`` with ``color`` ("#rrggbb") unless it already has it.
+    def style(self, seg, color):
+        if getattr(seg, "_fill", None) != color:
+            seg._fill = color  # last color given, so repeats cost nothing
+            seg.color(color)
+
+    # A turtle drawn as ``shape`` ("circle" or "square") in ``color``, at
+    # ``scale`` times the 20 px cell.
+    def sprite(self, shape, color, scale=1.0):
+        t = self._turtle()
+        t.shape(shape)
+        t.color(color)
+        if scale != 1.0:
+            t.shapesize(scale, scale)
+        return t
+
+
+RENDERERS = ("turtle", "canvas")  # rendering backends by name (see make_backend)
+
+
+# The rendering backend called ``name`` (one of RENDERERS) drawing on ``wn``.
+def make_backend(name, wn):
+    if name == "canvas":
+        from .canvas import CanvasBackend  # only imported when chosen
+        return CanvasBackend(wn)
+    if name != "turtle":
+        raise ValueError("unknown renderer {!r}".format(name))
+    return TurtleBackend(wn)
+
+
+# Compare the turtle-drawn checkerboard the single-player game used to draw
+# with the cached background image: startup time and canvas item count.
+def measure_background():
+    import shutil
+    import turtle
+
+    global BACKGROUND_CACHE
+    wn = turtle.Screen()
+    wn.setup(width=600, height=600)
+    wn.tracer(0)
+    canvas = wn.getcanvas()
+    spec = dict(checker=(30, "#3aa75e", "#2a6f3a"), border=(3, "#123d1f"))
+
+    base = len(canvas.find_all())
+    start = time.perf_counter()
+    drawer = turtle.Turtle()
+    drawer.hideturtle()
+    drawer.penup()
+    for y in range(-300, 300, 30):
+        for x in range(-300, 300, 30):
+            drawer.color(spec["checker"][1] if (x // 30 + y // 30) % 2 == 0 else spec["checker"][2])
+            drawer.goto(x, y)
+            drawer.begin_fill()
+            for _ in range(4):
+                drawer.pendown()
+                drawer.forward(30)
+                drawer.left(90)
+            drawer.end_fill()
+            drawer.penup()
+    wn.update()
+    print("turtle-drawn:   {:7.1f} ms  {:4d} canvas items".format(
+        (time.perf_counter() - start) * 1000, len(canvas.find_all()) - base))
+    wn.clear()
+    wn.tracer(0)
+
+    saved, BACKGROUND_CACHE = BACKGROUND_CACHE, tempfile.mkdtemp()
+    try:
+        for label in ("image (cold):", "image (cached):"):
+            base = len(canvas.find_all())
+            start = time.perf_counter()
+            set_background(wn, 300, "#2e8b57", **spec)
+            wn.update()
+            print("{:15s} {:7.1f} ms  {:4d} canvas items".format(
+                label, (time.perf_counter() - start) * 1000, len(canvas.find_all()) - base))
+    finally:
+        shutil.rmtree(BACKGROUND_CACHE, ignore_errors=True)
+        BACKGROUND_CACHE = saved
+
+
+# Finish drawing the first frame on screen ``wn`` and print how long after the
+# package was imported it appeared (the games' ``--first-frame`` option).
+def report_first_frame(wn):
+    wn.update()
+    print("first frame after {:.0f} ms".format((time.perf_counter() - STARTED) * 1000))
+
+
+# Print the rendering counters of a finished game as one JSON line: the
+# FrameRenderer ``frames``' timings and any other named ``counters`` dicts.
+def report_render(frames, **counters):
+    print(json.dumps(dict(frames=frames.stats(), **counters)))
+
+
+if __name__ == "__main__":
+    measure_background()
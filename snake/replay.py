@@ -0,0 +1,288 @@
+"""Deterministic game recordings and replays.
+
+A game is fully determined by its rules, its seed and the direction each
+snake is given before every tick, so a recording stores only those. The file
+is a small header, the game settings as JSON, then fixed-size 4-byte records
+``(ticks since the previous record, player index, direction code)``, one per
+direction change. Records are aligned and fixed-size, so a replay reads them
+straight from a memory map.
+
+``Replay`` re-simulates a recording with the headless engine at full speed.
+It keeps a snapshot of the game (snake.snapshot) every ``snapshot_every``
+ticks, so jumping back to any tick costs at most that many ticks of
+simulation. A game resumed from a save is recorded with its starting
+snapshot in the settings instead of a seed. Opening a file that is not a
+complete recording header raises ValueError.
+
+Usage: python -m snake replay RECORDING [--tick N]
+"""
+import base64
+import bisect
+import json
+import mmap
+import os
+import struct
+import time
+
+from . import DATA_DIR
+from . import snapshot
+from .engine import CODES, DIRECTION_CODES, Game, Snake
+
+RECORDING_DIR = os.path.join(DATA_DIR, "snake_replays")
+KEEP_RECORDINGS = 50  # newest recordings kept in RECORDING_DIR
+
+MAGIC = b"SNKR"
+VERSION = 1
+HEADER = struct.Struct("<4sB3xII")  # magic, version, ticks (0: unknown), settings length
+TICKS_OFFSET = 8  # byte offset of the ticks field, patched when recording ends
+RECORD = struct.Struct("<HBB")  # ticks since the previous record, player, direction
+MAX_DELTA = 0xFFFF  # longer gaps are bridged with filler records
+FILLER = 0xFF  # player index of a record that only advances the tick
+
+
+# A fresh timestamped path in RECORDING_DIR for a game called ``label``.
+# Older recordings are pruned first so that, with the new one, at most
+# KEEP_RECORDINGS are kept.
+def recording_path(label):
+    prune_recordings(RECORDING_DIR, KEEP_RECORDINGS - 1)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(RECORDING_DIR, "{}-{}-{}.snkr".format(stamp, label, os.getpid()))
+
+
+# Delete all but the ``keep`` most recently written recordings in
+# ``directory`` (best-effort: files that cannot be removed are left).
+def prune_recordings(directory, keep):
+    try:
+        paths = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".snkr")]
+        paths.sort(key=lambda path: (os.path.getmtime(path), path), reverse=True)
+    except OSError:
+        return
+    for path in paths[max(0, keep):]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class Recorder:
+    """Write the seed, settings and per-tick direction changes of a game.
+
+    Call ``step`` instead of ``game.step``. Directions can also be changed
+    between ticks (key handlers calling ``snake.turn``): the recorder compares
+    every snake's direction with the one it last saw before each tick, so
+    those changes are recorded too. Best-effort like the high scores: if the
+    file cannot be written the game runs on unrecorded.
+    """
+
+    # Start recording ``game`` to ``path``: a new game (built with ``seed``)
+    # or one already under way or of unknown seed (``seed`` None), which is
+    # stored as a snapshot. Snakes' starting high scores are stored too.
+    def __init__(self, path, game, seed):
+        self.path = path
+        self.game = game
+        self._seen = [snake.direction for snake in game.snakes]  # direction per snake after the last tick
+        self._last_tick = 0  # tick of the previous record
+        settings = {
+            "seed": seed,
+            "playfield": game.playfield,
+            "food": game.food,
+            "delay": game.start_delay,
+            "delay_step": game.delay_step,
+            "min_delay": game.min_delay,
+            "reset_delay_on_death": game.reset_delay_on_death,
+            "snakes": [{"name": s.name, "start": s.start, "direction": s.start_direction,
+                        "high": s.high_score} for s in game.snakes],
+        }
+        if game.tick or seed is None:
+            settings["snapshot"] = base64.b64encode(snapshot.dumps(game)).decode("ascii")
+        meta = json.dumps(settings).encode("utf-8")
+        meta += b" " * (-len(meta) % RECORD.size)  # keep records aligned
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._out = open(path, "wb")
+            self._out.write(HEADER.pack(MAGIC, VERSION, 0, len(meta)) + meta)
+        except OSError:
+            self._out = None
+
+    # Record direction changes since the last tick, then step the game.
+    def step(self, inputs=None):
+        game = self.game
+        if inputs:
+            for name, direction in inputs.items():
+                game.by_name[name].turn(direction)
+        for i, snake in enumerate(game.snakes):
+            if snake.direction != self._seen[i]:
+                self._write(game.tick, i, CODES[snake.direction])
+        events = game.step()
+        self._seen = [snake.direction for snake in game.snakes]
+        return events
+
+    # Append one record, bridging long gaps with filler records.
+    def _write(self, tick, player, code):
+        if self._out is None:
+            return
+        delta = tick - self._last_tick
+        while delta > MAX_DELTA:
+            self._out.write(RECORD.pack(MAX_DELTA, FILLER, 0))
+            delta -= MAX_DELTA
+        self._out.write(RECORD.pack(delta, player, code))
+        self._last_tick = tick
+
+    # Store the final tick count and close the file.
+    def close(self):
+        if self._out is None:
+            return
+        try:
+            self._out.seek(TICKS_OFFSET)
+            self._out.write(struct.pack("<I", self.game.tick))
+            self._out.close()
+        except OSError:
+            pass
+        self._out = None
+
+
+class Replay:
+    """Re-simulate a recording with the headless engine.
+
+    ``game`` is rebuilt from the recorded settings and seed; ``step``
+    advances it one tick, applying the recorded direction changes first, and
+    returns the engine's events, so a replay can be drawn like a live game.
+    ``seek`` jumps to any tick from the nearest earlier snapshot.
+    """
+
+    # Open ``path`` (memory-mapped) and set the game up at tick 0.
+    def __init__(self, path, snapshot_every=500):
+        self.path = path
+        self.snapshot_every = snapshot_every  # ticks between snapshots
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise ValueError("{} is not a version {} snake recording".format(path, VERSION))
+        try:
+            magic, version, ticks, meta_len = HEADER.unpack_from(self._map)
+            if magic == MAGIC and version == VERSION:
+                self.settings = json.loads(self._map[HEADER.size:HEADER.size + meta_len].decode("utf-8"))
+        except (struct.error, ValueError, UnicodeDecodeError):  # truncated or garbled
+            magic = None
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError("{} is not a version {} snake recording".format(path, VERSION))
+        self._start = HEADER.size + meta_len  # offset of the first record
+        self.game = self._new_game()
+        self._offset = self._start  # offset of the next record
+        self._next_tick = 0  # tick the next record applies to (None: no more records)
+        self._read_delta()
+        if not ticks:  # the game did not end cleanly: stop at the last change
+            ticks = self._last_record_tick()
+        self.ticks = ticks  # length of the recorded game
+        self._snapshot_ticks = []  # ticks of the snapshots, ascending
+        self._snapshots = []  # (snake.snapshot bytes, record offset, next record tick)
+        self._snapshot()
+
+    # Build the recorded game as it was when recording started, high scores
+    # included (recordings without them start from 0).
+    def _new_game(self):
+        s = self.settings
+        if "snapshot" in s:
+            return snapshot.loads(base64.b64decode(s["snapshot"]))
+        snakes = [Snake(entry["name"], tuple(entry["start"]), entry["direction"])
+                  for entry in s["snakes"]]
+        for snake, entry in zip(snakes, s["snakes"]):
+            snake.high_score = entry.get("high", 0)
+        food = tuple(s["food"]) if s["food"] is not None else None
+        return Game(snakes, playfield=s["playfield"], food=food, delay=s["delay"],
+                    delay_step=s["delay_step"], min_delay=s["min_delay"],
+                    reset_delay_on_death=s["reset_delay_on_death"], seed=s["seed"])
+
+    # Add the delta of the record at the cursor to the next record tick.
+    def _read_delta(self):
+        if self._offset + RECORD.size > len(self._map):
+            self._next_tick = None
+        else:
+            self._next_tick += RECORD.unpack_from(self._map, self._offset)[0]
+
+    # Tick of the last record (used when the total was never written).
+    def _last_record_tick(self):
+        count = (len(self._map) - self._start) // RECORD.size  # whole records only
+        records = self._map[self._start:self._start + count * RECORD.size]
+        return sum(delta for delta, _, _ in RECORD.iter_unpack(records))
+
+    # True once the whole recording has been played.
+    def done(self):
+        return self.game.tick >= self.ticks
+
+    # Apply the recorded direction changes for this tick and step the game.
+    def step(self):
+        game = self.game
+        while self._next_tick == game.tick:
+            _, player, code = RECORD.unpack_from(self._map, self._offset)
+            if player != FILLER:
+                game.snakes[player].direction = DIRECTION_CODES[code]
+            self._offset += RECORD.size
+            self._read_delta()
+        events = game.step()
+        if game.tick % self.snapshot_every == 0 and game.tick > self._snapshot_ticks[-1]:
+            self._snapshot()
+        return events
+
+    # Remember the current game and record cursor for ``seek``.
+    def _snapshot(self):
+        self._snapshot_ticks.append(self.game.tick)
+        self._snapshots.append((snapshot.dumps(self.game), self._offset, self._next_tick))
+
+    # Move the game to ``tick``: step forward, or restart from the nearest
+    # earlier snapshot when that is closer (or the tick lies behind us). The
+    # game's snakes and grid are updated in place, so references stay valid.
+    # Ticks before the start of the recording go to its start.
+    def seek(self, tick):
+        tick = max(tick, self._snapshot_ticks[0])
+        i = bisect.bisect_right(self._snapshot_ticks, tick) - 1
+        if not self._snapshot_ticks[i] <= self.game.tick <= tick:
+            saved, self._offset, self._next_tick = self._snapshots[i]
+            snapshot.restore(self.game, saved)
+        while self.game.tick < tick:
+            self.step()
+
+    # Play to the end of the recording without rendering; returns the game.
+    def run(self):
+        while not self.done():
+            self.step()
+        return self.game
+
+    # Release the memory map and the file.
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+# Command-line entry point: re-simulate a recording and print where it ends.
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Re-simulate a snake recording headlessly.")
+    parser.add_argument("recording", help="a .snkr file")
+    parser.add_argument("--tick", type=int, help="stop at this tick instead of the end")
+    args = parser.parse_args(argv)
+    try:
+        replay = Replay(args.recording)
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    started = time.perf_counter()
+    if args.tick is not None:
+        replay.seek(args.tick)
+    else:
+        replay.run()
+    elapsed = time.perf_counter() - started
+    game = replay.game
+    print("tick {} of {} in {:.3f}s ({:.0f} ticks/s)".format(
+        game.tick, replay.ticks, elapsed, game.tick / elapsed if elapsed else 0))
+    for snake in game.snakes:
+        print("{}: score {} high {} length {}".format(
+            snake.name, snake.score, snake.high_score, len(snake.segments) + 1))
+    replay.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""High-score persistence shared by the snake games."""
+import atexit
+import json
+import os
+import stat
+import tempfile
+import threading
+
+from . import DATA_DIR
+
+HIGH_SCORE_FILE = os.path.join(DATA_DIR, "snake_highscores.json")
+
+_UMASK = os.umask(0)  # read once: os.umask can only be read by setting it
+os.umask(_UMASK)
+
+
+# Load high scores from a JSON file and return them as a dict ({} on any error).
+def load_highscores(path=HIGH_SCORE_FILE):
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+    return {}
+
+
+# Atomically replace the JSON file with ``data``: write a temp file in the same
+# directory, fsync it and rename it over the old one, so a crash mid-write
+# leaves either the old or the new file, never a truncated one. The new file
+# keeps the old one's permissions (a first save gets the usual ones for the
+# umask, not mkstemp's owner-only mode). Best-effort: returns False instead
+# of raising on I/O errors.
+def save_highscores(data, path=HIGH_SCORE_FILE):
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp = None
+    try:
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        fd, tmp = tempfile.mkstemp(prefix=".snake_highscores.", suffix=".tmp", dir=directory)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+        return True
+    except Exception:
+        if tmp is not None:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+        return False
+
+
+class HighScoreStore:
+    """In-memory high scores that are written to disk in batches.
+
+    ``update`` only touches memory, so it is safe to call from the game loop
+    on every food. A background thread writes pending changes at most once
+    every ``interval`` seconds, and ``close`` (also run at interpreter exit)
+    writes whatever is left. Every write is atomic (see save_highscores).
+    """
+
+    # Load ``path`` and start the background writer (interval=None: no thread,
+    # changes are only written by ``flush``/``close``).
+    def __init__(self, path=HIGH_SCORE_FILE, interval=5.0):
+        self.path = path  # JSON file backing the store
+        self.interval = interval  # seconds between background flushes
+        self.writes = 0  # number of successful writes
+        self._scores = load_highscores(path)  # name -> best score
+        self._dirty = False  # True while memory is ahead of the file
+        self._lock = threading.Lock()  # guards _scores and _dirty
+        self._stop = threading.Event()  # set by close() to end the writer
+        self._thread = None
+        if interval:
+            self._thread = threading.Thread(target=self._run, name="highscore-writer", daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+
+    # Best score recorded for ``name``.
+    def get(self, name, default=0):
+        with self._lock:
+            return self._scores.get(name, default)
+
+    # Record ``score`` for ``name`` if it beats the stored one; returns True if it did.
+    def update(self, name, score):
+        with self._lock:
+            if score <= self._scores.get(name, 0):
+                return False
+            self._scores[name] = score
+            self._dirty = True
+            return True
+
+    # Write pending changes now (no-op when nothing changed).
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = dict(self._scores)
+            self._dirty = False
+        if save_highscores(data, self.path):
+            self.writes += 1
+        else:
+            with self._lock:
+                self._dirty = True  # try again on the next flush
+
+    # Stop the background writer and write anything still pending.
+    def close(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    # Background writer: flush every ``interval`` seconds until closed.
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
@@ -0,0 +1,369 @@
+"""Networked multiplayer: an asyncio server running authoritative games.
+
+Clients connect over TCP (localhost by default) and exchange JSON lines.
+
+Client to server:
+  {"op": "join", "room": "lobby", "as": "player" | "spectator"}
+  {"op": "turn", "dir": "up"}
+
+Server to client:
+  {"op": "state", ...}  full state: on joining and whenever a client is resynced
+  {"op": "tick", "t": 12, "s": [[x, y, length, score], ...], "f": [x, y], "e": [...]}
+                         one delta per tick: every snake's new head cell,
+                         length and score ("f" only when the food moved, "e"
+                         only when there were events)
+
+A delta is a few numbers per snake whatever the body lengths; ClientState
+shows how a client rebuilds bodies from it. Each room runs the two-player
+rules with snake.engine.Game in its own task, and one event loop serves
+many rooms. Ticks never wait for a client: every client has a bounded
+outgoing queue, a client that falls a full queue behind has its backlog
+dropped and gets a fresh state instead, and one that keeps falling behind
+is disconnected.
+
+Usage: python -m snake server [--port 8765] [--seats 2]
+       python -m snake server --load ROOMS   (local load test with random clients)
+"""
+import asyncio
+import json
+import random
+from collections import deque
+
+from .engine import DELAY, Game, Snake, start_cells
+from .input import InputQueue
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+
+class Client:
+    """One connection: a bounded outgoing queue drained by its own writer task.
+
+    A client whose queue fills up more than ``max_resyncs`` times in a row
+    is disconnected; ``forgive`` messages queued without a drop in between
+    clear its count, so lagging now and then never adds up.
+    """
+
+    # Wrap ``writer``; at most ``max_queue`` messages wait to be sent.
+    def __init__(self, writer, max_queue=64, max_resyncs=5, forgive=600):
+        self.writer = writer
+        self.max_queue = max_queue  # messages buffered before the client counts as slow
+        self.max_resyncs = max_resyncs  # resyncs tolerated before disconnecting
+        self.forgive = forgive  # messages queued without a drop that clear the resync count
+        self.room = None  # Room joined, if any
+        self.seat = None  # snake name when playing, None when spectating
+        self.needs_state = True  # next broadcast sends the full state
+        self.resyncs = 0  # times the backlog was dropped since the client last kept up
+        self._streak = 0  # messages queued since the last drop
+        self._queue = deque()  # encoded lines waiting for the socket
+        self._wake = asyncio.Event()  # set when the queue has something
+        self.closed = False
+
+    # Queue one encoded message without waiting. A full queue is dropped and
+    # the client is resynced with the next broadcast instead.
+    def send(self, line):
+        if self.closed:
+            return
+        if len(self._queue) >= self.max_queue:
+            self._queue.clear()
+            self.needs_state = True
+            self.resyncs += 1
+            self._streak = 0
+            if self.resyncs > self.max_resyncs:
+                self.close()
+            return
+        self._queue.append(line)
+        self._wake.set()
+        self._streak += 1
+        if self._streak >= self.forgive:
+            self.resyncs = 0
+
+    # Writer task: send queued messages, waiting for the socket to drain.
+    async def pump(self):
+        try:
+            while not self.closed:
+                await self._wake.wait()
+                self._wake.clear()
+                while self._queue and not self.closed:
+                    self.writer.write(self._queue.popleft())
+                    await self.writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.close()
+
+    # Stop sending and close the connection.
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self._wake.set()
+            self.writer.close()
+
+
+# Encode one message as a JSON line.
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class Room:
+    """One game: seats for players, any number of spectators, a tick task.
+
+    Seats are filled in order as players join; a free seat's snake waits at
+    its start cell. Inputs go through one InputQueue per seat, drained once
+    per tick, so each tick applies at most one turn per player.
+    """
+
+    # Create the game for ``seats`` snakes; ``on_empty(room)`` runs when the
+    # last client leaves.
+    def __init__(self, name, seats=2, seed=None, on_empty=None):
+        self.name = name
+        snakes = [Snake("P{}".format(i + 1), start) for i, start in enumerate(start_cells(seats))]
+        self.game = Game(snakes, delay=DELAY, seed=seed)
+        self.inputs = {s.name: InputQueue(s) for s in snakes}  # buffered turns per seat
+        self.clients = []  # players and spectators
+        self.seated = {}  # snake name -> client
+        self.on_empty = on_empty
+        self._food = self.game.food  # food cell in the last broadcast
+        self._task = None
+
+    # Add ``client`` as a player (if ``play`` and a seat is free) or spectator.
+    def join(self, client, play=True):
+        client.room = self
+        if play:
+            for snake in self.game.snakes:
+                if snake.name not in self.seated:
+                    self.seated[snake.name] = client
+                    client.seat = snake.name
+                    break
+        client.needs_state = True
+        self.clients.append(client)
+        if self._task is None:
+            self._task = asyncio.ensure_future(self.run())
+
+    # Remove ``client``; its seat frees up for the next player.
+    def leave(self, client):
+        if client in self.clients:
+            self.clients.remove(client)
+        if client.seat is not None:
+            self.seated.pop(client.seat, None)
+            client.seat = None
+        if not self.clients:
+            if self._task is not None:
+                self._task.cancel()
+                self._task = None
+            if self.on_empty is not None:
+                self.on_empty(self)
+
+    # Queue a turn from a seated client.
+    def turn(self, client, direction):
+        if client.seat is not None and direction in ("up", "down", "left", "right"):
+            self.inputs[client.seat].press(direction)
+
+    # The full state: bodies (head first), scores, directions and food.
+    def state(self, client=None):
+        game = self.game
+        return {"op": "state", "room": self.name, "t": game.tick,
+                "you": client.seat if client is not None else None,
+                "snakes": [{"name": s.name, "body": [list(c) for c in s.cells()],
+                            "score": s.score, "dir": s.direction} for s in game.snakes],
+                "f": list(game.food) if game.food else None}
+
+    # Step the game once and return the encoded delta.
+    def step(self):
+        game = self.game
+        inputs = {}
+        for name, queue in self.inputs.items():
+            turn = queue.drain()
+            if turn:
+                inputs[name] = turn
+        events = game.step(inputs)
+        delta = {"op": "tick", "t": game.tick,
+                 "s": [[s.head[0], s.head[1], len(s.segments) + 1, s.score] for s in game.snakes]}
+        if game.food != self._food:
+            self._food = game.food
+            delta["f"] = list(game.food) if game.food else None
+        shown = [[e.kind, e.player, e.detail] for e in events if e.kind in ("food", "death")]
+        if shown:
+            delta["e"] = shown
+        return encode(delta)
+
+    # Tick task: step on a fixed schedule and broadcast each delta once
+    # encoded; sending never blocks the tick.
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        due = loop.time()
+        while True:
+            line = self.step()
+            for client in list(self.clients):
+                if client.closed:
+                    self.leave(client)
+                elif client.needs_state:
+                    client.needs_state = False
+                    client.send(encode(self.state(client)))
+                else:
+                    client.send(line)
+            due += self.game.delay
+            await asyncio.sleep(max(0.0, due - loop.time()))
+
+
+class Server:
+    """Accepts connections and routes them to rooms by name."""
+
+    # Rooms get ``seats`` snakes each.
+    def __init__(self, seats=2, max_queue=64):
+        self.seats = seats
+        self.max_queue = max_queue
+        self.rooms = {}  # name -> Room
+
+    # Serve one connection until it closes.
+    async def handle(self, reader, writer):
+        client = Client(writer, self.max_queue)
+        pump = asyncio.ensure_future(client.pump())
+        try:
+            while not client.closed:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    continue  # longer than the reader's limit: skipped
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(message, dict):
+                    continue
+                op = message.get("op")
+                if op == "join" and client.room is None:
+                    name = str(message.get("room", "lobby"))
+                    room = self.rooms.get(name)
+                    if room is None:
+                        room = self.rooms[name] = Room(name, self.seats, on_empty=self._drop)
+                    room.join(client, play=message.get("as", "player") == "player")
+                elif op == "turn" and client.room is not None:
+                    client.room.turn(client, message.get("dir"))
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            client.close()
+            if client.room is not None:
+                client.room.leave(client)
+            pump.cancel()
+
+    # Forget a room once everyone has left.
+    def _drop(self, room):
+        if self.rooms.get(room.name) is room:
+            del self.rooms[room.name]
+
+    # Listen on ``host``:``port`` until cancelled.
+    async def serve(self, host=HOST, port=PORT):
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+class ClientState:
+    """Client-side copy of a room, rebuilt from "state" and "tick" messages.
+
+    Each tick the old head joins the front of the body and the body is cut to
+    the reported length, which is exactly how the engine moves, grows and
+    resets snakes.
+    """
+
+    # Start empty; ``apply`` the server's messages in order.
+    def __init__(self):
+        self.tick = 0
+        self.you = None  # our snake name, or None when spectating
+        self.names = []  # snake names in seat order
+        self.heads = []  # head cell per snake
+        self.bodies = []  # body deque per snake, nearest the head first
+        self.scores = []
+        self.food = None
+
+    # Update from one decoded server message.
+    def apply(self, message):
+        if message["op"] == "state":
+            self.tick = message["t"]
+            self.you = message.get("you")
+            self.names = [s["name"] for s in message["snakes"]]
+            self.heads = [tuple(s["body"][0]) for s in message["snakes"]]
+            self.bodies = [deque(tuple(c) for c in s["body"][1:]) for s in message["snakes"]]
+            self.scores = [s["score"] for s in message["snakes"]]
+            self.food = tuple(message["f"]) if message["f"] else None
+        elif message["op"] == "tick":
+            self.tick = message["t"]
+            for i, (x, y, length, score) in enumerate(message["s"]):
+                body = self.bodies[i]
+                body.appendleft(self.heads[i])
+                while len(body) > length - 1:
+                    body.pop()
+                self.heads[i] = (x, y)
+                self.scores[i] = score
+            if "f" in message:
+                self.food = tuple(message["f"]) if message["f"] else None
+
+
+# Connect to a server, join ``room`` and turn randomly every few ticks for
+# ``seconds``; returns the client's ClientState (used by the load test).
+async def random_client(room, seconds, host=HOST, port=PORT, play=True):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(encode({"op": "join", "room": room, "as": "player" if play else "spectator"}))
+    state = ClientState()
+    rng = random.Random()
+    loop = asyncio.get_running_loop()
+    end = loop.time() + seconds
+    try:
+        while loop.time() < end:
+            try:
+                line = await asyncio.wait_for(reader.readline(), end - loop.time())
+            except asyncio.TimeoutError:
+                break
+            if not line:
+                break
+            state.apply(json.loads(line))
+            if play and state.tick % 4 == 0:
+                writer.write(encode({"op": "turn", "dir": rng.choice(("up", "down", "left", "right"))}))
+    finally:
+        writer.close()
+    return state
+
+
+# Load test: ``rooms`` rooms with a full set of random players and one
+# spectator each, all on this process's event loop, for ``seconds``.
+async def load_test(rooms, seats, seconds, port):
+    server = Server(seats)
+    listener = await asyncio.start_server(server.handle, HOST, port)
+    clients = []
+    for r in range(rooms):
+        for _ in range(seats):
+            clients.append(random_client("room{}".format(r), seconds, port=port))
+        clients.append(random_client("room{}".format(r), seconds, port=port, play=False))
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    states = await asyncio.gather(*clients)
+    elapsed = loop.time() - started
+    listener.close()
+    ticks = sum(s.tick for s in states) / max(1, len(states))
+    print("{} rooms, {} clients: {:.0f} ticks seen per client in {:.1f}s (schedule: {:.0f})".format(
+        rooms, len(states), ticks, elapsed, seconds / DELAY))
+
+
+# Command-line entry point: serve rooms, or run the local load test.
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Authoritative snake server.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--seats", type=int, default=2, help="snakes per room")
+    parser.add_argument("--load", type=int, metavar="ROOMS", help="run a local load test instead")
+    parser.add_argument("--seconds", type=float, default=5.0, help="load test duration")
+    args = parser.parse_args(argv)
+    if args.load:
+        asyncio.run(load_test(args.load, args.seats, args.seconds, args.port))
+    else:
+        asyncio.run(Server(args.seats).serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Single-player snake on a turtle window."""
+import json
+import os
+import random  # Import random module to seed each game
+import tkinter as tk
+import turtle  # Import turtle module for graphics
+
+from . import DATA_DIR, snapshot
+from .engine import Game, Snake
+from .input import InputQueue
+from .loop import FixedStep
+from .profile import profiler_from_env
+from .render import (RENDERERS, BodyView, Hud, SegmentPool, Sprite, make_backend, report_first_frame,
+                     report_render, set_background)
+from .replay import Recorder, recording_path
+from .scores import HighScoreStore
+from .telemetry import telemetry_from_env
+
+SAVE_FILE = os.path.join(DATA_DIR, "snake_save.snks")  # game saved on pause and on exit
+
+
+# Set up the window and play until it is closed. With ``resume`` the game
+# saved in SAVE_FILE carries on where it stopped. With ``first_frame`` the
+# game stops after drawing its first frame (used to time startup).
+# ``renderer`` names the backend drawing the snake and food (see
+# snake.render.RENDERERS).
+def play(first_frame=False, resume=False, renderer="turtle"):
+    # Game state lives in the headless engine; the turtles below only draw it.
+    # Single-player rules: speed up 0.001 per food down to 0.01 s a tick, reset speed on death.
+    game = None
+    if resume and os.path.exists(SAVE_FILE):
+        try:
+            game = snapshot.load(SAVE_FILE)   # Exactly as saved, random state included
+        except (OSError, ValueError) as exc:  # unreadable, corrupt or from another version
+            print("Cannot resume from {} ({}); starting a new game".format(SAVE_FILE, exc))
+    if game is not None:
+        snake = game.snakes[0]
+        seed = None
+    else:
+        snake = Snake("single", (0, 0))
+        seed = random.randrange(2 ** 32)  # fresh every game, recorded so it can be replayed
+        game = Game([snake], food=(0, 5), delay=0.1, delay_step=0.001, min_delay=0.01,
+                    reset_delay_on_death=True, seed=seed)
+
+    # Key presses are buffered and applied one per tick, so fast presses are
+    # neither lost nor able to reverse the snake into itself
+    inputs = InputQueue(snake)
+
+    # High score persists across sessions (same file as the two-player game)
+    highs = HighScoreStore()
+    snake.high_score = max(snake.high_score, highs.get(snake.name))
+
+    # Every game is recorded (seed, or the resumed state, plus direction changes)
+    # to snake_replays/ once the stored high score is set; startup timing runs
+    # (first_frame) are not
+    recorder = None if first_frame else Recorder(recording_path("single"), game, seed)
+
+    # Save the game so it can be resumed (--resume); best-effort like the scores
+    def save_game():
+        try:
+            snapshot.save(game, SAVE_FILE)
+        except OSError:
+            pass
+
+    # Set up the game window with softer visuals
+    wn = turtle.Screen()              # Create main game window object
+    wn.title("Snake Game")           # Set the game window title
+    wn.bgcolor("#2e8b57")            # Softer green background for comfortable play
+    wn.setup(width=600, height=600)   # Set the window size to 600x600 pixels
+    wn.tracer(0)                      # Turn off automatic animation for manual updates
+
+    # Attempt to set a custom window icon named 'snake_icon.ico' or 'snake_icon.png'
+    # Place the icon file alongside this script. Falls back silently if missing.
+    try:
+        root = wn.getcanvas().winfo_toplevel()
+        icon_path = os.path.join(DATA_DIR, 'snake_icon.ico')
+        png_path = os.path.join(DATA_DIR, 'snake_icon.png')
+        if os.path.exists(icon_path):
+            root.iconbitmap(icon_path)
+        elif os.path.exists(png_path):
+            img = tk.PhotoImage(file=png_path)
+            root.iconphoto(True, img)
+    except Exception:
+        pass
+
+    # Create a subtle two-tone grid to aid orientation (smaller squares) and a
+    # visible but unobtrusive border for the play area. Both are rendered once into
+    # a cached background image instead of being drawn square by square.
+    warna1 = "#3aa75e"              # Subtle light green
+    warna2 = "#2a6f3a"              # Subtle dark green
+    ukuran_kotak = 30                 # Smaller squares make movement feel finer
+    set_background(wn, 300, "#2e8b57",
+                   checker=(ukuran_kotak, warna1, warna2),
+                   border=(3, "#123d1f"))
+
+    # Snake and food are turtles or raw canvas items, depending on the backend
+    backend = make_backend(renderer, wn)
+
+    # Snake head (rounded for friendlier look): warm color, slightly larger
+    head = backend.sprite("circle", "#ffb86b", 1.2)
+
+    # Snake food (rounded and high-contrast red)
+    food = backend.sprite("circle", "#ff4040", 0.9)
+
+    # Pen to write the score
+    pen = turtle.Turtle()
+    pen.speed(0)
+    pen.shape("square")
+    pen.color("white")
+    pen.penup()
+    pen.hideturtle()
+    pen.goto(0, 260)
+    score_hud = Hud(pen, font=("Courier", 20, "normal"))  # Slightly smaller font
+    score_hud.show("Score: 0  High Score: {}".format(snake.high_score))
+
+    # Instruction / status pen
+    instr = turtle.Turtle()
+    instr.speed(0)
+    instr.hideturtle()
+    instr.penup()
+    instr.goto(0, 230)
+    instr.color("white")
+    instr_hud = Hud(instr, font=("Courier", 14, "normal"))
+    instr_hud.show("WASD to move  |  P to Pause/Resume")
+
+    # Pause/resume the game loop (frames and input keep running while paused)
+    def toggle_pause():
+        loop.toggle_pause()
+        if loop.paused:
+            save_game()                   # Pausing also saves, in case the window is closed
+            lag = inputs.latency()        # Key press to movement, recent presses
+            instr_hud.show("Paused (P)  |  input lag p50 {:.0f} / p99 {:.0f} ms"
+                           .format(lag["p50"], lag["p99"]))
+        else:
+            instr_hud.show("WASD to move  |  P to Pause/Resume")
+
+    # Movement control functions for the snake (queued; the tick applies one per move)
+    def go_up():
+        inputs.press("up")       # Queue a turn up
+
+    def go_down():
+        inputs.press("down")     # Queue a turn down
+
+    def go_left():
+        inputs.press("left")     # Queue a turn left
+
+    def go_right():
+        inputs.press("right")    # Queue a turn right
+
+    # Create a new body segment: rounded, slightly darker than the head for depth
+    def new_segment():
+        return backend.sprite("circle", "#e09a5a", 0.9)
+
+    # Frames only redraw the turtles that changed since the last frame (and are timed)
+    frames = backend.renderer
+
+    # Segments follow the engine body; each tick only the tail segment moves.
+    # Segments dropped on a reset go back to the pool and are reused when growing.
+    pool = SegmentPool(new_segment, discard=backend.discard)
+    body = BodyView(snake, lambda index: pool.acquire(), release_segment=pool.release,
+                    touch=frames.touch)
+    head_sprite = Sprite(head, frames.touch)
+    food_sprite = Sprite(food, frames.touch)
+
+    # Move the changed segment turtles, the head and the food to their cells, and
+    # rewrite the score only if it changed
+    def render():
+        body.sync()
+        head_sprite.place(snake.head)
+        food_sprite.place(game.food)  # None only while the board is full
+        score_hud.show("Score: {}  High Score: {}".format(snake.score, snake.high_score))
+
+    # Opt-in profiling (SNAKE_PROFILE=1, or a .csv/.json trace path): per-phase
+    # frame timings with a p50/p99 overlay; when off, nothing below is wrapped
+    profiler, trace_path = profiler_from_env()
+    profiler.instrument(game)
+    read_input = profiler.wrap("input", inputs.drain)
+    # Opt-in telemetry (SNAKE_TELEMETRY=events.jsonl): every step's events go
+    # to a background writer; when off, the step is not wrapped either
+    telemetry, totals = telemetry_from_env()
+    step = recorder.step if recorder is not None else game.step  # recorded unless timing startup
+    simulate = profiler.wrap("simulate", telemetry.wrap_step(game, step))
+    record_high = profiler.wrap("persist", highs.update)
+    if profiler.enabled:
+        stats_pen = turtle.Turtle()
+        stats_pen.hideturtle()
+        stats_pen.penup()
+        stats_pen.goto(0, -290)
+        profiler.show_on(Hud(stats_pen, font=("Courier", 9, "normal"), color="white"))
+
+    # Keyboard controls
+    wn.listen()                       # Enable keyboard listener
+    wn.onkeypress(go_up, "w")        # Bind W to move up
+    wn.onkeypress(go_down, "s")      # Bind S to move down
+    wn.onkeypress(go_left, "a")      # Bind A to move left
+    wn.onkeypress(go_right, "d")     # Bind D to move right
+    wn.onkeypress(toggle_pause, "p") # Bind P to pause/resume
+
+    # One simulation tick; a collision freezes the game for a second without
+    # blocking input or drawing
+    def tick():
+        turn = read_input()           # At most one queued turn per tick
+        events = simulate({snake.name: turn} if turn else None)  # Advance one tick (and record it)
+        for event in events:
+            if event.kind == "death":     # Border or body collision
+                loop.hold(1.0)            # Pause 1 second after collision
+            elif event.kind == "high":    # New high score (written to disk in batches)
+                record_high(snake.name, event.detail)
+
+    # Main game loop: ticks run every game.delay seconds on a monotonic clock and
+    # each frame draws only what changed (keeps game speed consistent)
+    loop = FixedStep(tick, profiler.wrap("render", lambda: frames.frame(render, budget=game.delay)),
+                     lambda: game.delay)
+    loop.advance = profiler.wrap_frame(loop.advance)  # one frame: due ticks plus drawing
+    loop.run_on(wn)
+    try:
+        if first_frame:
+            report_first_frame(wn)        # Startup timing only: stop after one frame
+        else:
+            wn.mainloop()
+    finally:
+        if not first_frame:
+            save_game()               # Resume later with --resume
+        highs.close()                 # Save the high score when the window closes
+        if recorder is not None:
+            recorder.close()          # Finish the recording
+        if trace_path:
+            profiler.dump(trace_path)     # Per-frame phase timings
+        telemetry.close()             # Write the last events
+        if not first_frame:
+            report_render(frames, pool=pool.stats(), loop=loop.stats())  # Frames, segments, dropped ticks
+        if totals is not None:
+            print(json.dumps(totals.summary()))
+
+
+# Command-line entry point.
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Single-player snake.")
+    parser.add_argument("--resume", action="store_true", help="carry on with the game saved on pause or exit")
+    parser.add_argument("--first-frame", action="store_true", help="exit after the first frame (startup timing)")
+    parser.add_argument("--renderer", choices=RENDERERS, default="turtle",
+                        help="draw the snake with turtles or straight onto the Tk canvas (default turtle)")
+    args = parser.parse_args(argv)
+    play(first_frame=args.first_frame, resume=args.resume, renderer=args.renderer)
+
+
+if __name__ == "__main__":
+    main()
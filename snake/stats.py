@@ -0,0 +1,14 @@
+"""Latency summaries shared by the bots, input queues, profiler, telemetry and benchmarks."""
+
+
+# Summary of ``values`` (numbers, in any order) each multiplied by ``scale``
+# (e.g. 1000.0 for seconds to ms): {"count", "mean", "p50", "p99", "max"},
+# all zero when there are no values.
+def percentiles(values, scale=1.0):
+    ordered = sorted(value * scale for value in values)
+    if not ordered:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+    n = len(ordered)
+    return {"count": n, "mean": sum(ordered) / n,
+            "p50": ordered[n // 2], "p99": ordered[min(n - 1, int(n * 0.99))],
+            "max": ordered[-1]}
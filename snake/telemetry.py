@@ -0,0 +1,265 @@
+"""Game-event telemetry: a bounded, non-blocking event stream to pluggable sinks.
+
+The game loop hands each tick's engine events to ``Telemetry.record_step``,
+which turns them into records and appends them to a bounded in-memory queue.
+Nothing on that path blocks or does I/O: when the queue is full new records
+are dropped and counted. A background thread drains the queue every
+``interval`` seconds and passes each batch to every sink's ``write``.
+
+Records are dicts with the wall time ``t``, the game ``tick`` and a ``kind``:
+
+  food   player, score (with this food), length (before growing),
+         food (new food cell)
+  grow   player, length (after the move that added a segment)
+  high   player, score
+  speed  delay (seconds per tick, whenever it changes: faster after a
+         food, back to the start after a death in the single-player game)
+  death  player, cause ("border", "self", "other" or "head" for
+         head-to-head), score and length the snake had when it died
+         (food eaten on the tick it died included)
+  tick   ms (time spent stepping the simulation)
+
+Turn it on with the SNAKE_TELEMETRY environment variable, naming a JSON-lines
+file (rotated when it grows large); an in-process Aggregator is attached too.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from .engine import FOOD_SCORE
+from .stats import percentiles
+
+
+class Telemetry:
+    """Bounded queue of telemetry records drained to sinks by a background thread.
+
+    A sink is any object with ``write(records)`` (a list of dicts) and
+    ``close()``. With no sinks the stream is disabled and ``record_step``
+    returns at once.
+    """
+
+    # Queue at most ``size`` records; flush them to ``sinks`` every ``interval`` seconds.
+    def __init__(self, sinks=(), size=4096, interval=0.5):
+        self.sinks = list(sinks)
+        self.enabled = bool(self.sinks)
+        self.size = size  # most records waiting for the writer
+        self.interval = interval  # seconds between background flushes
+        self.emitted = 0  # records queued
+        self.dropped = 0  # records lost because the queue was full
+        self._queue = deque()  # records waiting for the writer
+        self._lengths = {}  # snake name -> length at the end of the previous tick
+        self._scores = {}  # snake name -> score at the end of the previous tick
+        self._delay = None  # delay at the end of the previous tick
+        self._lock = threading.Lock()  # one flush at a time
+        self._stop = threading.Event()  # set by close() to end the writer
+        self._thread = None
+        if self.enabled:
+            self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    # Queue one record without waiting (dropped and counted if the queue is full).
+    def emit(self, kind, tick, **fields):
+        if not self.enabled:
+            return
+        if len(self._queue) >= self.size:
+            self.dropped += 1
+            return
+        fields["t"] = time.time()
+        fields["tick"] = tick
+        fields["kind"] = kind
+        self._queue.append(fields)
+        self.emitted += 1
+
+    # Turn one snake.engine.Game step into records: its ``events``, snakes that
+    # grew, and the ``seconds`` the step took. Scores are the ones this step
+    # reached: the previous tick's plus the food eaten in this one (a snake
+    # that died has already been reset to 0 when the step returns).
+    def record_step(self, game, events, seconds):
+        if not self.enabled:
+            return
+        tick, lengths, scores = game.tick, self._lengths, self._scores
+        eaten = {}  # player -> food eaten this tick
+        for event in events:
+            if event.kind == "food":
+                eaten[event.player] = eaten.get(event.player, 0) + 1
+                self.emit("food", tick, player=event.player,
+                          score=scores.get(event.player, 0) + FOOD_SCORE * eaten[event.player],
+                          length=lengths.get(event.player, 1),
+                          food=list(event.detail) if event.detail else None)
+            elif event.kind == "high":
+                self.emit("high", tick, player=event.player, score=event.detail)
+            elif event.kind == "death":
+                self.emit("death", tick, player=event.player, cause=event.detail,
+                          score=scores.get(event.player, 0) + FOOD_SCORE * eaten.get(event.player, 0),
+                          length=lengths.get(event.player, 1))
+        for snake in game.snakes:
+            length = len(snake.segments) + 1
+            if length > lengths.get(snake.name, 1):
+                self.emit("grow", tick, player=snake.name, length=length)
+            lengths[snake.name] = length
+            scores[snake.name] = snake.score
+        if game.delay != self._delay:
+            self._delay = game.delay
+            self.emit("speed", tick, delay=game.delay)
+        self.emit("tick", tick, ms=seconds * 1000.0)
+
+    # Return ``step`` (a function that steps ``game`` and returns its events)
+    # with every call timed and recorded; ``step`` itself when disabled.
+    # Scores and lengths start from ``game``'s current ones (a resumed game).
+    def wrap_step(self, game, step):
+        if not self.enabled:
+            return step
+        for snake in game.snakes:
+            self._scores[snake.name] = snake.score
+            self._lengths[snake.name] = len(snake.segments) + 1
+        clock = time.perf_counter
+
+        def recorded(*args, **kwargs):
+            start = clock()
+            events = step(*args, **kwargs)
+            self.record_step(game, events, clock() - start)
+            return events
+        return recorded
+
+    # Hand every queued record to the sinks now.
+    def flush(self):
+        with self._lock:
+            batch = []
+            while self._queue:
+                batch.append(self._queue.popleft())
+            if batch:
+                for sink in self.sinks:
+                    sink.write(batch)
+
+    # Stop the writer, flush what is left and close the sinks.
+    def close(self):
+        if not self.enabled:
+            return
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        for sink in self.sinks:
+            sink.close()
+        self.enabled = False
+
+    # Background writer: flush every ``interval`` seconds until closed.
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+
+class JsonLinesSink:
+    """Append records to a JSON-lines file, rotating it when it gets large.
+
+    When a write would take the file past ``max_bytes`` it is renamed to
+    ``path.1`` (older files shift to ``path.2`` ... ``path.<backups>``, the
+    oldest is deleted) and a new file is started.
+    """
+
+    # Write to ``path``, keeping at most ``backups`` rotated files.
+    def __init__(self, path, max_bytes=10 * 1024 * 1024, backups=3):
+        self.path = path
+        self.max_bytes = max_bytes  # size that triggers a rotation
+        self.backups = backups  # rotated files kept
+        self.rotations = 0  # rotations so far
+        self._file = open(path, "a", encoding="utf-8")
+
+    # Append a batch of records, one JSON object per line.
+    def write(self, records):
+        data = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+        if self._file.tell() and self._file.tell() + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+
+    # Shift the rotated files up by one and start a new file.
+    def _rotate(self):
+        self._file.close()
+        for n in range(self.backups - 1, 0, -1):
+            older = "{}.{}".format(self.path, n)
+            if os.path.exists(older):
+                os.replace(older, "{}.{}".format(self.path, n + 1))
+        if self.backups:
+            os.replace(self.path, self.path + ".1")
+        else:
+            os.remove(self.path)
+        self.rotations += 1
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    # Close the file.
+    def close(self):
+        self._file.close()
+
+
+class Aggregator:
+    """In-process running totals over the record stream, read with ``summary``.
+
+    Counts records by kind, food and deaths (by cause) per player and the
+    longest snake, and keeps the last ``window`` tick durations for
+    percentiles.
+    """
+
+    # Start with empty totals.
+    def __init__(self, window=4096):
+        self.kinds = {}  # kind -> records seen
+        self.players = {}  # player -> {"food", "deaths": {cause: n}, "max_length"}
+        self.delay = None  # last reported delay
+        self._ticks = deque(maxlen=window)  # recent tick durations in ms
+        self._lock = threading.Lock()  # written by the telemetry thread, read by anyone
+
+    # Totals for ``player``, created on first use.
+    def _player(self, name):
+        player = self.players.get(name)
+        if player is None:
+            player = self.players[name] = {"food": 0, "deaths": {}, "max_length": 1}
+        return player
+
+    # Add a batch of records to the totals.
+    def write(self, records):
+        with self._lock:
+            for record in records:
+                kind = record["kind"]
+                self.kinds[kind] = self.kinds.get(kind, 0) + 1
+                if kind == "tick":
+                    self._ticks.append(record["ms"])
+                elif kind == "food":
+                    self._player(record["player"])["food"] += 1
+                elif kind == "grow":
+                    player = self._player(record["player"])
+                    player["max_length"] = max(player["max_length"], record["length"])
+                elif kind == "death":
+                    deaths = self._player(record["player"])["deaths"]
+                    deaths[record["cause"]] = deaths.get(record["cause"], 0) + 1
+                elif kind == "speed":
+                    self.delay = record["delay"]
+
+    # Totals as a JSON-ready dict, with tick duration p50/p99/max in ms.
+    def summary(self):
+        with self._lock:
+            ms = percentiles(self._ticks)
+            return {"records": dict(self.kinds),
+                    "players": {name: {"food": p["food"], "deaths": dict(p["deaths"]),
+                                       "max_length": p["max_length"]}
+                                for name, p in self.players.items()},
+                    "delay": self.delay,
+                    "tick_ms": {"p50": ms["p50"], "p99": ms["p99"], "max": ms["max"]}}
+
+    # Nothing to release.
+    def close(self):
+        pass
+
+
+# Telemetry configured by SNAKE_TELEMETRY (disabled when unset) and its
+# Aggregator (None when disabled). The variable names the JSON-lines file.
+def telemetry_from_env():
+    path = os.environ.get("SNAKE_TELEMETRY", "")
+    if path in ("", "0"):
+        return Telemetry(), None
+    aggregator = Aggregator()
+    return Telemetry([JsonLinesSink(path), aggregator]), aggregator
@@ -0,0 +1,245 @@
+"""Bot tournaments: many seeded headless matches over a process pool.
+
+Every match is a snake.engine.Game between bots from snake.ai.BOTS (one
+snake each, two or more per match) played for a fixed number of ticks, with
+its own seed, so any result can be replayed exactly. Seeds are split into
+shards of consecutive seeds and shards run in separate processes; results are
+streamed as each shard finishes and can be appended to a JSON-lines file, so
+an interrupted run keeps everything finished so far (see ``--resume``).
+
+Usage: python -m snake tournament --bots greedy,random --matches 1000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .ai import BOTS, MATCH_CELLS, make_bot
+from .engine import Game, Snake, start_cells
+
+TICKS = 2000  # ticks per match
+
+
+# Play one match between ``bots`` (BOTS names, one snake each) and return its
+# result as a JSON-ready dict. The same seed always gives the same result.
+# Every step is recorded to ``telemetry`` (a snake.telemetry.Telemetry) if given.
+def play_match(seed, bots, ticks=TICKS, telemetry=None):
+    snakes = [Snake("{}{}".format(name, i + 1), start)
+              for i, (name, start) in enumerate(zip(bots, start_cells(len(bots))))]
+    players = [make_bot(name, random.Random("{}:{}".format(seed, i)), MATCH_CELLS) for i, name in enumerate(bots)]
+    game = Game(snakes, seed=seed)
+    game.food = game.place_food()  # the seed decides the opening, not the fixed default food
+    food = dict.fromkeys(game.by_name, 0)  # food eaten per snake
+    deaths = dict.fromkeys(game.by_name, 0)  # deaths per snake
+    step = game.step if telemetry is None else telemetry.wrap_step(game, game.step)
+    for _ in range(ticks):
+        inputs = {snake.name: bot.choose(game, snake) for snake, bot in zip(snakes, players)}
+        for event in step(inputs):
+            if event.kind == "food":
+                food[event.player] += 1
+            elif event.kind == "death":
+                deaths[event.player] += 1
+
+    # The winner ate the most food; a shared top count is a draw.
+    most = max(food.values())
+    leaders = [name for name, eaten in food.items() if eaten == most]
+    return {
+        "seed": seed,
+        "ticks": ticks,
+        "winner": leaders[0] if len(leaders) == 1 else None,
+        "players": [{"name": snake.name, "bot": name, "food": food[snake.name],
+                     "deaths": deaths[snake.name], "best": snake.high_score,
+                     "length": len(snake.segments) + 1,
+                     "max_length": snake.high_score // 10 + 1}
+                    for snake, name in zip(snakes, bots)],
+    }
+
+
+# Play every seed of ``shard`` in this process; a match that raises becomes an
+# error entry instead of failing the rest of the shard.
+def play_shard(shard, bots, ticks=TICKS):
+    results = []
+    for seed in shard:
+        try:
+            results.append(play_match(seed, bots, ticks))
+        except Exception as exc:
+            results.append({"seed": seed, "error": repr(exc)})
+    return results
+
+
+# Run ``shards`` on a fresh pool of ``workers`` processes and yield
+# (shard, results) as each finishes; results is None if the shard's worker
+# died (which also fails every shard still queued on that pool).
+def _run_pool(shards, bots, ticks, workers):
+    with ProcessPoolExecutor(workers) as pool:
+        futures = {pool.submit(play_shard, shard, bots, ticks): shard for shard in shards}
+        for future in as_completed(futures):
+            try:
+                results = future.result()
+            except Exception:
+                results = None
+            yield futures[future], results
+
+
+# Play ``seeds`` in shards of ``shard_size`` over ``workers`` processes
+# (None: one per core) and yield every match result as its shard finishes,
+# in completion order.
+#
+# A dead worker only costs the shards that were unfinished at the time: they
+# are run again on a new pool. A shard that has failed ``retries`` times gets
+# a last try on a pool of its own, so one shard that keeps killing its worker
+# cannot keep taking the others down; if that fails too its seeds are
+# reported as error entries.
+def run_tournament(bots, seeds, ticks=TICKS, shard_size=25, workers=None, retries=2):
+    seeds = list(seeds)
+    todo = [tuple(seeds[i:i + shard_size]) for i in range(0, len(seeds), shard_size)]
+    failures = dict.fromkeys(todo, 0)
+    while todo:
+        failed = []
+        for shard, results in _run_pool(todo, bots, ticks, workers):
+            if results is None:
+                failures[shard] += 1
+                failed.append(shard)
+            else:
+                yield from results
+        todo = [shard for shard in failed if failures[shard] < retries]
+        for shard in failed:
+            if failures[shard] < retries:
+                continue
+            for _, results in _run_pool([shard], bots, ticks, 1):
+                if results is None:
+                    results = [{"seed": seed, "error": "worker process died"} for seed in shard]
+                yield from results
+
+
+class Report:
+    """Running win/score/length totals over match results, per seat.
+
+    A seat is one position in the match line-up (``greedy1``, ``greedy2``...),
+    so a bot playing against itself still gets separate rows.
+    """
+
+    # Start empty totals for the line-up ``bots``.
+    def __init__(self, bots):
+        self.bots = list(bots)
+        self.matches = 0  # matches counted
+        self.draws = 0  # matches with no single winner
+        self.errors = []  # seeds whose match failed
+        self.seats = {}  # seat name -> totals
+        for i, name in enumerate(self.bots):
+            self.seats["{}{}".format(name, i + 1)] = {
+                "bot": name, "wins": 0, "food": 0, "deaths": 0,
+                "best": 0, "best_total": 0, "max_length": 0, "length_total": 0}
+
+    # Count one result from play_match (or an error entry).
+    def add(self, result):
+        if "error" in result:
+            self.errors.append(result["seed"])
+            return
+        self.matches += 1
+        if result["winner"] is None:
+            self.draws += 1
+        for player in result["players"]:
+            seat = self.seats[player["name"]]
+            seat["wins"] += player["name"] == result["winner"]
+            seat["food"] += player["food"]
+            seat["deaths"] += player["deaths"]
+            seat["best"] = max(seat["best"], player["best"])
+            seat["best_total"] += player["best"]
+            seat["max_length"] = max(seat["max_length"], player["max_length"])
+            seat["length_total"] += player["max_length"]
+
+    # The report as a JSON-ready dict with per-seat rates and means.
+    def summary(self):
+        n = self.matches or 1
+        seats = {}
+        for name, seat in self.seats.items():
+            seats[name] = {
+                "bot": seat["bot"],
+                "wins": seat["wins"],
+                "win_rate": seat["wins"] / n,
+                "mean_food": seat["food"] / n,
+                "mean_deaths": seat["deaths"] / n,
+                "mean_best": seat["best_total"] / n,
+                "best": seat["best"],
+                "mean_max_length": seat["length_total"] / n,
+                "max_length": seat["max_length"],
+            }
+        return {"bots": self.bots, "matches": self.matches, "draws": self.draws,
+                "errors": sorted(self.errors), "seats": seats}
+
+
+# Read the results already in a JSON-lines file (skipping a torn last line).
+def load_results(path):
+    results = []
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    results.append(json.loads(line))
+                except ValueError:
+                    pass
+    return results
+
+
+# True if the file at ``path`` ends with a newline.
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+# Command-line entry point: run the tournament and print the report as JSON.
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run seeded bot matches over a process pool.")
+    parser.add_argument("--bots", default="greedy,greedy",
+                        help="comma-separated line-up, one snake per bot (choices: {})".format(", ".join(sorted(BOTS))))
+    parser.add_argument("--matches", type=int, default=100, help="number of matches (one seed each)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first match")
+    parser.add_argument("--ticks", type=int, default=TICKS, help="ticks per match")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--shard", type=int, default=25, help="consecutive seeds per shard")
+    parser.add_argument("--out", help="append every result to this JSON-lines file as it finishes")
+    parser.add_argument("--resume", action="store_true", help="skip seeds already in --out")
+    args = parser.parse_args(argv)
+
+    bots = args.bots.split(",")
+    unknown = [name for name in bots if name not in BOTS]
+    if unknown:
+        parser.error("unknown bot(s): {}".format(", ".join(unknown)))
+    start_cells(len(bots))  # fail early if the line-up does not fit
+
+    report = Report(bots)
+    seeds = range(args.seed, args.seed + args.matches)
+    if args.resume and args.out:
+        done = {r["seed"]: r for r in load_results(args.out) if "error" not in r and r["seed"] in seeds}
+        for result in done.values():
+            report.add(result)
+        seeds = [seed for seed in seeds if seed not in done]
+
+    out = None
+    if args.out:
+        torn = os.path.exists(args.out) and os.path.getsize(args.out) > 0 and not _ends_with_newline(args.out)
+        out = open(args.out, "a", encoding="utf-8")
+        if torn:
+            out.write("\n")  # start a fresh line after a half-written one
+    try:
+        for result in run_tournament(bots, seeds, args.ticks, args.shard, args.workers):
+            report.add(result)
+            if out is not None:
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+            finished = report.matches + len(report.errors)
+            if finished % args.shard == 0:
+                print("{}/{} matches".format(finished, args.matches), file=sys.stderr)
+    finally:
+        if out is not None:
+            out.close()
+    json.dump(report.summary(), sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""NumPy batch simulator: many independent snake boards stepped at once.
+
+Follows the rules of snake.engine.Game (movement, growth, food, border, self,
+other-snake and head-to-head collisions, in the same order) for ``num_envs``
+boards with ``len(starts)`` snakes each, using array operations over all
+boards instead of Python loops. Meant for bots and training, so there is no
+rendering and no speed-up ``delay``.
+
+Bodies are not stored as lists. Every board keeps two tensors: ``owner``
+(which snake last left each cell, 0 = none) and ``entry`` (the tick it left
+it). A cell is a body cell of snake p while ``tick - entry < length[p]``, so
+a move is one write per snake, the tail drops off by itself, growing is
+``length += 1`` and a reset is ``length = 0``.
+
+Requires NumPy (not needed by the games themselves).
+"""
+import numpy as np
+
+from .engine import CELL, PLAYFIELD
+
+# Action codes; KEEP leaves the direction unchanged.
+UP, DOWN, LEFT, RIGHT, KEEP = range(5)
+STOP = 4  # direction code of a snake that has not started moving yet
+
+# Death causes reported in ``VecSnake.cause``.
+ALIVE, BORDER, SELF, OTHER, HEAD = range(5)
+
+_DX = np.array([0, 0, -1, 1, 0], dtype=np.int32)  # x step per direction code
+_DY = np.array([1, -1, 0, 0, 0], dtype=np.int32)  # y step (y grows upwards)
+_OPP = np.array([DOWN, UP, RIGHT, LEFT, -1], dtype=np.int32)  # reverse of each action
+
+
+class VecSnake:
+    """``num_envs`` independent boards, each with one snake per start cell.
+
+    Coordinates are grid cells as in snake.engine, shifted so that board
+    index 0 is the bottom-left cell (``row = cy + half``, ``col = cx + half``).
+    ``step`` takes one action per snake and returns observations, rewards
+    (+1 per food, -1 per death) and done flags (the snake died and was reset
+    to its start cell, as in the games).
+    """
+
+    # Create the boards; ``starts`` are engine cells, ``food`` the first food cell.
+    def __init__(self, num_envs, starts=((0, 0),), playfield=PLAYFIELD, food=(0, 5), seed=None):
+        self.n = num_envs  # number of boards
+        self.p = len(starts)  # snakes per board
+        self.half = (playfield - CELL // 2) // CELL  # last cell inside the border
+        self.width = 2 * self.half + 1  # cells per row
+        self.rng = np.random.default_rng(seed)  # food placement
+        self._start = np.array(starts, dtype=np.int32) + self.half  # (p, 2) start x, y
+        self._first_food = (food[0] + self.half, food[1] + self.half)
+        self._boards = np.arange(self.n)  # row index for fancy indexing
+        self.reset()
+
+    # Put every board back in its initial state and return the observations.
+    def reset(self):
+        n, p, w = self.n, self.p, self.width
+        self.tick = 0  # ticks stepped (also the stamp written into ``entry``)
+        self.owner = np.zeros((n, w, w), dtype=np.int8)  # snake index + 1 per cell
+        self.entry = np.zeros((n, w, w), dtype=np.int32)  # tick the owner left the cell
+        self.length = np.zeros((n, p + 1), dtype=np.int32)  # body length per snake (column 0 unused)
+        self.hx = np.tile(self._start[:, 0], (n, 1))  # head x per snake
+        self.hy = np.tile(self._start[:, 1], (n, 1))  # head y per snake
+        self.dir = np.full((n, p), STOP, dtype=np.int32)  # direction codes
+        self.score = np.zeros((n, p), dtype=np.int64)  # 10 per food since the last death
+        self.cause = np.zeros((n, p), dtype=np.int8)  # death cause of the last step
+        self.fx = np.full(n, self._first_food[0], dtype=np.int32)  # food x (-1: board full)
+        self.fy = np.full(n, self._first_food[1], dtype=np.int32)  # food y
+        return self.observe()
+
+    # Boolean (boards, w, w) mask of body cells as of stamp ``tick`` for ``boards``.
+    def _occupied(self, boards, tick):
+        owner = self.owner[boards]
+        if self.p == 1:  # one snake: no per-cell length lookup needed
+            lengths = self.length[boards, 1][:, None, None]
+        else:
+            lengths = self.length[boards][np.arange(len(owner))[:, None, None], owner]
+        return (owner > 0) & (tick - self.entry[boards] < lengths)
+
+    # Move the food on ``boards`` to a uniformly random cell with no body or head.
+    def _place_food(self, boards):
+        free = ~self._occupied(boards, self.tick).reshape(len(boards), -1)
+        rows = np.arange(len(boards))
+        for q in range(self.p):
+            free[rows, self.hy[boards, q] * self.width + self.hx[boards, q]] = False
+        keys = self.rng.random(free.shape)
+        keys[~free] = -1.0
+        pick = keys.argmax(axis=1)
+        full = ~free.any(axis=1)
+        self.fy[boards] = np.where(full, -1, pick // self.width)
+        self.fx[boards] = np.where(full, -1, pick % self.width)
+
+    # Reset snake ``q`` on the boards in ``mask`` after a collision.
+    def _kill(self, mask, q, cause):
+        self.length[mask, q + 1] = 0
+        self.score[mask, q] = 0
+        self.hx[mask, q] = self._start[q, 0]
+        self.hy[mask, q] = self._start[q, 1]
+        self.dir[mask, q] = STOP
+        self.cause[mask, q] = cause
+
+    # Advance every board one tick.
+    #
+    # ``actions`` has one action code per snake, shape (num_envs,) for one
+    # snake per board or (num_envs, snakes). Returns (obs, rewards, dones)
+    # with rewards and dones shaped like the actions; obs is None when
+    # ``observe`` is False (cheaper when the caller reads the state directly).
+    def step(self, actions, observe=True):
+        a = np.asarray(actions, dtype=np.int32).reshape(self.n, self.p)
+        boards, w = self._boards, self.width
+
+        # Turn, refusing to reverse onto the body.
+        turn = (a != KEEP) & (self.dir != _OPP[a])
+        self.dir = np.where(turn, a, self.dir)
+
+        # Food is eaten before moving; it moves at once, avoiding bodies and heads.
+        eat = (self.hx == self.fx[:, None]) & (self.hy == self.fy[:, None])
+        relocate = np.flatnonzero(eat.any(axis=1) | (self.fx < 0))
+        if len(relocate):
+            self._place_food(relocate)
+        self.length[:, 1:] += eat
+        self.score += 10 * eat
+
+        # Move: the old head cell joins the body, the tail drops off by itself.
+        self.tick += 1
+        tick = self.tick
+        for q in range(self.p):
+            grown = np.flatnonzero(self.length[:, q + 1] > 0)  # snakes with no body write nothing
+            self.owner[grown, self.hy[grown, q], self.hx[grown, q]] = q + 1
+            self.entry[grown, self.hy[grown, q], self.hx[grown, q]] = tick
+        self.hx += _DX[self.dir]
+        self.hy += _DY[self.dir]
+
+        # Border, self and other-snake collisions, in player order.
+        self.cause[:] = ALIVE
+        for q in range(self.p):
+            x, y = self.hx[:, q], self.hy[:, q]
+            inside = (x >= 0) & (x < w) & (y >= 0) & (y < w)
+            xc, yc = np.clip(x, 0, w - 1), np.clip(y, 0, w - 1)
+            own = self.owner[boards, yc, xc]
+            hit = inside & (own > 0) & (tick - self.entry[boards, yc, xc] < self.length[boards, own])
+            self._kill(~inside, q, BORDER)
+            self._kill(hit & (own == q + 1), q, SELF)
+            self._kill(hit & (own != q + 1), q, OTHER)
+
+        # Head-to-head collisions reset every snake sharing a head cell.
+        if self.p > 1:
+            same = (self.hx[:, :, None] == self.hx[:, None, :]) & (self.hy[:, :, None] == self.hy[:, None, :])
+            crashed = (same.sum(axis=2) > 1)
+            for q in range(self.p):
+                self._kill(crashed[:, q], q, HEAD)
+
+        dones = self.cause != ALIVE
+        rewards = eat.astype(np.float32) - dones
+        shape = np.shape(actions)
+        return (self.observe() if observe else None,
+                rewards.reshape(shape), dones.reshape(shape))
+
+    # Board codes per cell, int8 (num_envs, w, w), row 0 at the bottom:
+    # 0 empty, 1 food, 2 + 2q body of snake q, 3 + 2q head of snake q.
+    def observe(self):
+        boards = self._boards
+        occ = self._occupied(boards, self.tick)
+        obs = occ * (2 * self.owner)
+        has_food = self.fx >= 0
+        obs[boards[has_food], self.fy[has_food], self.fx[has_food]] = 1
+        for q in range(self.p):
+            obs[boards, self.hy[:, q], self.hx[:, q]] = 3 + 2 * q
+        return obs
@@ -0,0 +1,55 @@
+"""Let the tests import the snake package from the project directory, and
+shared fixtures: a stub clock and headless games played by greedy bots."""
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snake.ai import GreedyBot  # noqa: E402  (needs the path above)
+from snake.engine import Game, Snake, start_cells  # noqa: E402
+
+
+class Clock:
+    """A clock that only moves when told to (set or add to ``now``)."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+# A stub clock starting at 0 for code that takes a ``clock``.
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+# Factory giving a greedy bot to every snake of a game: ``turns = greedy_turns(game, seed)``
+# seeds the bots ``seed``, ``seed + 1``, ... and ``turns()`` is their choice for the next tick.
+@pytest.fixture
+def greedy_turns():
+    def make(game, seed=0):
+        bots = [GreedyBot(random.Random(seed + i)) for i in range(len(game.snakes))]
+
+        def turns():
+            return {s.name: bot.choose(game, s) for s, bot in zip(game.snakes, bots)}
+        return turns
+    return make
+
+
+# Factory for a game of ``count`` snakes "S0", "S1", ... on the start cells,
+# seeded ``seed``, with the first food placed from that seed unless
+# ``place_food`` is False (the random state is then untouched, as a recorder
+# expects): ``game, turns = greedy_game(count, seed)`` (``turns`` as for greedy_turns).
+@pytest.fixture
+def greedy_game(greedy_turns):
+    def make(count, seed=7, place_food=True):
+        game = Game([Snake("S{}".format(i), cell) for i, cell in enumerate(start_cells(count))], seed=seed)
+        if place_food:
+            game.food = game.place_food()
+        return game, greedy_turns(game)
+    return make
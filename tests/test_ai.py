@@ -0,0 +1,31 @@
+"""Bots from snake.ai on headless games."""
+import random
+
+from snake.ai import GreedyBot, contested_cells, safe_moves
+from snake.engine import Game, Snake, start_cells
+
+
+# Two greedy bots from the mirrored two-player starts no longer crash
+# head-to-head at the food forever; the food gets eaten.
+def test_greedy_bots_avoid_head_to_head(greedy_turns):
+    game = Game([Snake("S{}".format(i + 1), start) for i, start in enumerate(start_cells(2))], seed=1)
+    turns = greedy_turns(game)
+    heads = food = 0
+    for _ in range(3000):
+        for event in game.step(turns()):
+            heads += event.kind == "death" and event.detail == "head"
+            food += event.kind == "food"
+    assert heads < 50
+    assert food > 50
+
+
+# Safe moves exclude walls, bodies and reversing; contested cells are the
+# cells next to other heads, and a greedy bot stays out of them.
+def test_safe_and_contested_cells():
+    a, b = Snake("A", (0, 0), "right"), Snake("B", (2, 0), "left")
+    game = Game([a, b], seed=1)
+    assert sorted(safe_moves(game, a)) == ["down", "right", "up"]
+    assert game.grid.index((1, 0)) in contested_cells(game, a)
+    assert game.grid.index((0, 1)) not in contested_cells(game, a)
+    game.food = (1, 0)  # straight ahead, but B can reach it too
+    assert GreedyBot(random.Random(1)).choose(game, a) != "right"
@@ -0,0 +1,40 @@
+"""snake.bench: scenario selection and regression checks against a baseline."""
+import json
+
+from snake import bench
+
+
+# A results file with ``ticks_per_s`` and ``p99_us`` per scenario.
+def results(**scenarios):
+    return {"results": {name.replace("_", "/"): {"ticks_per_s": speed, "p99_us": p99}
+                        for name, (speed, p99) in scenarios.items()}}
+
+
+# Slower ticks or a higher p99 beyond the threshold are regressions; new
+# scenarios and changes within the threshold are not.
+def test_compare_flags_regressions(capsys):
+    baseline = results(a_x=(1000.0, 10.0), b_x=(1000.0, 10.0), c_x=(1000.0, 10.0), d_x=(1000.0, 0.0))
+    new = results(a_x=(850.0, 10.0), b_x=(1000.0, 12.0), c_x=(950.0, 10.5), d_x=(1000.0, 5.0), e_x=(1.0, 1.0))
+    assert bench.compare(new, baseline, 0.10) == ["a/x", "b/x"]
+    assert bench.compare(new, baseline, 0.25) == []
+    assert capsys.readouterr().out.count("REGRESSION") == 2
+
+
+# ``--only`` patterns match whole names, and ``--compare`` sets the exit
+# status: 1 against a much faster baseline, 0 against a much slower one.
+def test_main_only_and_exit_status(tmp_path):
+    out = str(tmp_path / "run.json")
+    assert bench.main(["--ticks", "50", "--only", "headless", "--out", out]) == 0
+    with open(out, encoding="utf-8") as f:
+        assert json.load(f)["results"] == {}
+    args = ["--ticks", "50", "--only", "headless/length=10", "--only", "snapshot/length=10", "--out", out]
+    assert bench.main(args) == 0
+    with open(out, encoding="utf-8") as f:
+        run = json.load(f)
+    assert sorted(run["results"]) == ["headless/length=10", "snapshot/length=10"]
+    for factor, status in ((1000.0, 1), (0.001, 0)):
+        baseline = {"results": {name: {"ticks_per_s": r["ticks_per_s"] * factor, "p99_us": r["p99_us"] / factor}
+                                for name, r in run["results"].items()}}
+        path = tmp_path / "baseline.json"
+        path.write_text(json.dumps(baseline))
+        assert bench.main(args[:-2] + ["--compare", str(path)]) == status
@@ -0,0 +1,121 @@
+"""snake.engine: collision rules, food and the grid's free-cell set."""
+import random
+
+from snake.engine import Game, Grid, Snake
+
+
+# Events of kind ``kind`` as (player, detail) pairs.
+def of_kind(events, kind):
+    return [(e.player, e.detail) for e in events if e.kind == kind]
+
+
+# A snake of ``length`` cells lying left of ``head`` and moving right.
+def lying(name, head, length):
+    snake = Snake(name, head, "right")
+    return snake, [(head[0] - k, head[1]) for k in range(1, length)]
+
+
+# Put ``body`` on ``game``'s grid as ``snake``'s segments.
+def place(game, snake, body):
+    for cell in body:
+        snake.segments.append(cell)
+        game.grid.fill(game.grid.index(cell), snake.mark)
+
+
+# Leaving the board resets the snake at its start cell.
+def test_border_death():
+    snake = Snake("A", (0, 0), "right")
+    game = Game([snake], food=None)
+    for _ in range(game.half):
+        assert not of_kind(game.step(), "death")
+    assert of_kind(game.step(), "death") == [("A", "border")]
+    assert snake.head == (0, 0) and not snake.segments and snake.resets == 1
+
+
+# Turning back into the body is a self collision; reversing is ignored.
+def test_self_collision_and_no_reversing():
+    snake, body = lying("A", (0, 0), 5)
+    game = Game([snake], food=None)
+    place(game, snake, body)
+    snake.turn("left")  # straight back: ignored
+    assert snake.direction == "right"
+    game.step({"A": "up"})
+    game.step({"A": "left"})
+    assert of_kind(game.step({"A": "down"}), "death") == [("A", "self")]
+
+
+# Running into another snake's body kills only the runner.
+def test_other_collision():
+    a = Snake("A", (0, -1), "up")
+    b, body = lying("B", (3, 0), 6)
+    b.direction = "up"  # moving away; its body still covers (0, 0)
+    game = Game([a, b], food=None)
+    place(game, b, body)
+    assert of_kind(game.step(), "death") == [("A", "other")]
+    assert b.resets == 0 and len(b.segments) == 5
+
+
+# Two heads on the same cell both die.
+def test_head_to_head():
+    a, b = Snake("A", (-1, 0), "right"), Snake("B", (1, 0), "left")
+    game = Game([a, b], food=None)
+    assert of_kind(game.step(), "death") == [("A", "head"), ("B", "head")]
+
+
+# Food scores, grows the snake by one on its next move and reappears on a
+# free cell; the game speeds up down to its floor.
+def test_food_grows_and_speeds_up():
+    snake = Snake("A", (0, 0), "up")
+    game = Game([snake], food=(0, 1), delay=0.1, delay_step=0.06, min_delay=0.05, seed=3)
+    game.step()
+    events = game.step()
+    assert of_kind(events, "food")[0][0] == "A"
+    assert snake.score == 10 and snake.high_score == 10
+    assert game.delay == 0.05
+    game.step()
+    assert len(snake.segments) == 1
+    assert game.food not in snake.cells()
+
+
+# The free list holds exactly the empty cells and ``slot`` indexes it,
+# through any sequence of fills and empties.
+def test_grid_free_list_invariants():
+    grid = Grid(6)
+    rng = random.Random(5)
+    filled = set()
+    for _ in range(3000):
+        i = rng.randrange(grid.size)
+        if rng.random() < 0.6:
+            grid.fill(i, 1 + rng.randrange(3))
+            filled.add(i)
+        else:
+            grid.empty(i)
+            filled.discard(i)
+        free = grid.free[:grid.free_count]
+        assert set(free) == set(range(grid.size)) - filled
+        assert all(grid.slot[cell] == k for k, cell in enumerate(grid.free))
+        assert sorted(grid.free) == list(range(grid.size))
+
+
+# ``random_free`` only returns empty cells outside ``exclude`` and leaves the
+# same cells empty; a full grid has none.
+def test_random_free():
+    grid = Grid(2)
+    rng = random.Random(1)
+    for i in range(grid.size - 2):
+        grid.fill(i, 1)
+    last = grid.size - 1
+    assert {grid.random_free(rng, [last]) for _ in range(50)} == {grid.size - 2}
+    assert grid.free_count == 2 and set(grid.free[:2]) == {last - 1, last}
+    assert all(grid.slot[cell] == k for k, cell in enumerate(grid.free))
+    grid.fill(last - 1, 1)
+    grid.fill(last, 1)
+    assert grid.random_free(rng) is None
+
+
+# Index and cell are inverses, and cells outside the border have no index.
+def test_grid_index_round_trip():
+    grid = Grid(3)
+    for i in range(grid.size):
+        assert grid.index(grid.cell(i)) == i
+    assert grid.index((4, 0)) is None and grid.index((0, -4)) is None
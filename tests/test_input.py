@@ -0,0 +1,68 @@
+"""snake.input.InputQueue: one turn per tick, none lost or reversed."""
+from snake.engine import Game, Snake
+from snake.input import InputQueue
+
+
+# A snake moving right on an empty board, its input queue and the game.
+def moving_right(clock, size=3):
+    snake = Snake("A", (0, 0), "right")
+    return snake, InputQueue(snake, size=size, clock=clock), Game([snake], food=None)
+
+
+# Step ``game`` with the queue's turn for this tick; returns the turn.
+def tick(game, queue):
+    turn = queue.drain()
+    game.step({queue.snake.name: turn} if turn else None)
+    return turn
+
+
+# "up, left" pressed within one tick turns twice over two ticks: neither
+# press is lost and the snake never reverses into itself.
+def test_two_presses_in_one_tick(clock):
+    snake, queue, game = moving_right(clock)
+    queue.press("up")
+    queue.press("left")
+    assert [tick(game, queue) for _ in range(3)] == ["up", "left", None]
+    assert snake.direction == "left"
+    assert snake.head == (-2, 1)
+    assert queue.applied == 2
+
+
+# A reversal is judged against the direction the snake will have, i.e. the
+# last buffered press, not the one it has now.
+def test_reversal_checked_against_queued_direction(clock):
+    snake, queue, game = moving_right(clock)
+    queue.press("left")  # reverses "right": rejected
+    assert queue.rejected == 1
+    queue.press("up")
+    queue.press("down")  # reverses the queued "up": rejected
+    queue.press("left")  # fine after "up", though it reverses "right"
+    assert queue.rejected == 2
+    assert [tick(game, queue) for _ in range(3)] == ["up", "left", None]
+
+
+# Repeated presses and presses into a full buffer are dropped.
+def test_repeats_and_overflow_are_dropped(clock):
+    snake, queue, game = moving_right(clock, size=2)
+    queue.press("right")  # already moving right
+    queue.press("up")
+    queue.press("up")  # repeats the queued press
+    queue.press("left")
+    queue.press("down")  # buffer full
+    assert (queue.presses, queue.rejected, queue.dropped) == (5, 2, 1)
+    assert [tick(game, queue) for _ in range(3)] == ["up", "left", None]
+
+
+# Press-to-move latency percentiles cover the applied presses, in milliseconds.
+def test_latency(clock):
+    snake, queue, game = moving_right(clock)
+    assert queue.latency()["count"] == 0
+    for direction, wait in (("up", 0.010), ("right", 0.030), ("down", 0.020)):
+        queue.press(direction)
+        clock.now += wait
+        tick(game, queue)
+    lag = queue.latency()
+    assert lag["count"] == 3
+    assert abs(lag["max"] - 30.0) < 1e-6
+    assert abs(lag["mean"] - 20.0) < 1e-6
+    assert 10.0 <= lag["p50"] <= 30.0 and lag["p99"] <= lag["max"]
@@ -0,0 +1,27 @@
+"""snake.loop.FixedStep on a stub clock."""
+from snake.loop import FixedStep
+
+
+# Ticks run at the interval's rate, independent of how often frames come.
+def test_ticks_follow_the_interval(clock):
+    ticks = []
+    loop = FixedStep(lambda: ticks.append(clock.now), lambda: None, lambda: 0.25, clock=clock)
+    loop.advance()
+    for _ in range(10):
+        clock.now += 0.125
+        loop.advance()
+    assert len(ticks) == 5
+
+
+# A zero or negative tick length is clamped instead of dividing by zero,
+# and catching up is still capped per frame.
+def test_zero_interval_is_clamped(clock):
+    ticks = []
+    for interval in (0.0, -1.0):
+        loop = FixedStep(lambda: ticks.append(1), lambda: None, lambda: interval, clock=clock)
+        loop.advance()
+        clock.now += 1.0
+        assert loop.advance() >= 0.0
+        assert loop.dropped > 0
+    assert len(ticks) == 2 * loop.max_catch_up
+    assert loop.stats() == {"ticks": loop.max_catch_up, "dropped": loop.dropped}
@@ -0,0 +1,19 @@
+"""snake.multi command line: options rejected before any window opens."""
+import pytest
+
+multi = pytest.importorskip("snake.multi")  # needs tkinter
+
+
+# Even boards have no centre cell and boards under 11 cells cannot hold the
+# two-player starts; both are usage errors. Odd boards go on to play().
+@pytest.mark.parametrize("board, ok", [("10", False), ("9", False), ("-1", False), ("11", True), ("1001", True)])
+def test_board_is_validated(monkeypatch, board, ok):
+    played = []
+    monkeypatch.setattr(multi, "play", lambda *args, **kwargs: played.append(kwargs["board"]))
+    if ok:
+        multi.main(["--board", board])
+        assert played == [int(board)]
+    else:
+        with pytest.raises(SystemExit):
+            multi.main(["--board", board])
+        assert not played
@@ -0,0 +1,86 @@
+"""snake.profile.Profiler on a stub clock: exclusive phases and trace dumps."""
+import csv
+import json
+
+import pytest
+
+from snake.profile import COLUMNS, Profiler
+
+
+# A profiler with ``frames`` frames recorded: input takes 1 ms, the
+# simulation 5 ms of which 2 ms are collisions, rendering 4 ms, and 0.5 ms
+# of the frame is outside every phase.
+def profiled(clock, frames=3):
+    profiler = Profiler(size=4, clock=clock)
+
+    def spend(ms):
+        def run():
+            clock.now += ms / 1000.0
+        return run
+    read_input = profiler.wrap("input", spend(1.0))
+    collide = profiler.wrap("collide", spend(2.0))
+
+    def step():
+        clock.now += 0.001
+        collide()
+        clock.now += 0.002
+    simulate = profiler.wrap("simulate", step)
+    render = profiler.wrap("render", spend(4.0))
+
+    def frame():
+        read_input()
+        simulate()
+        render()
+        clock.now += 0.0005
+    frame = profiler.wrap_frame(frame)
+    for _ in range(frames):
+        frame()
+    return profiler
+
+
+# Nested phases are timed exclusively: collisions are not counted in the
+# simulation as well, and the frame covers everything.
+def test_nested_phases_are_exclusive(clock):
+    profiler = profiled(clock)
+    assert profiler.frames == 3
+    for row in profiler.rows():
+        assert row == pytest.approx([1.0, 3.0, 2.0, 4.0, 0.0, 10.5])
+    assert profiler.percentiles()["simulate"]["max"] == pytest.approx(3.0)
+
+
+# The ring buffer keeps the last ``size`` frames.
+def test_ring_keeps_the_last_frames(clock):
+    profiler = profiled(clock, frames=6)
+    assert len(profiler.rows()) == 4
+
+
+# CSV dumps have one row per kept frame, numbered from the oldest.
+def test_dump_csv(clock, tmp_path):
+    profiler = profiled(clock, frames=6)
+    path = str(tmp_path / "trace.csv")
+    profiler.dump(path)
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["index"] for row in rows] == ["2", "3", "4", "5"]
+    assert set(rows[0]) == {"index"} | {"{}_ms".format(c) for c in COLUMNS}
+    assert float(rows[0]["simulate_ms"]) == pytest.approx(3.0)
+
+
+# JSON dumps hold the columns, the rows and the percentiles.
+def test_dump_json(clock, tmp_path):
+    profiler = profiled(clock)
+    path = str(tmp_path / "trace.json")
+    profiler.dump(path)
+    with open(path, encoding="utf-8") as f:
+        trace = json.load(f)
+    assert trace["columns"] == ["{}_ms".format(c) for c in COLUMNS]
+    assert len(trace["frames"]) == 3
+    for row, kept in zip(trace["frames"], profiler.rows()):
+        assert row == pytest.approx(kept)
+    assert trace["percentiles"]["frame"]["p50"] == pytest.approx(10.5)
+
+
+# A disabled profiler hands the functions back unwrapped.
+def test_disabled_wraps_nothing():
+    profiler = Profiler(enabled=False)
+    assert profiler.wrap("input", len) is len and profiler.wrap_frame(len) is len
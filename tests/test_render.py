@@ -0,0 +1,206 @@
+"""snake.render views on stub turtles: BodyView, Sprite, SegmentPool, BoardView
+and FrameRenderer, and the tail gradient."""
+import random
+
+import pytest
+
+from snake.bench import make_game
+from snake.engine import to_pixels
+from snake.render import OFFSCREEN, BoardView, BodyView, FrameRenderer, SegmentPool, Sprite, gradient
+
+
+class Turtle:
+    """Stub segment turtle: position, visibility and color."""
+
+    def __init__(self):
+        self.pos = None
+        self.visible = True
+        self.fill = None
+
+    def goto(self, x, y=None):
+        self.pos = (x, y)
+
+    def showturtle(self):
+        self.visible = True
+
+    def hideturtle(self):
+        self.visible = False
+
+    def color(self, color):
+        self.fill = color
+
+
+class Screen:
+    """Stub turtle screen for BoardView (only the scroll region is set)."""
+
+    def screensize(self, w, h):
+        self.size = (w, h)
+
+
+class DrawnTurtle(Turtle):
+    """Stub turtle with the internals FrameRenderer redraws it through."""
+
+    def __init__(self, drawn):
+        super().__init__()
+        self.drawn = drawn  # list the turtle appends itself to when drawn
+
+    def _update_data(self):
+        pass
+
+    def _drawturtle(self):
+        self.drawn.append(self)
+
+
+class Canvas:
+    """Stub Tk canvas counting repaints."""
+
+    def __init__(self):
+        self.repaints = 0
+
+    def update(self):
+        self.repaints += 1
+
+
+class FrameScreen:
+    """Stub turtle screen for FrameRenderer, counting full updates."""
+
+    def __init__(self, internals=True):
+        self.updates = 0  # Screen.update() calls
+        self.canvas = Canvas()
+        if internals:
+            self._tracing = 0
+
+    def update(self):
+        self.updates += 1
+
+    def getcanvas(self):
+        return self.canvas
+
+
+# Greedy games with dying and growing snakes; each view's turtles always sit
+# on its snake's body cells (nearest the head first) and the leading ones
+# carry their index's color, also when frames skip ticks.
+def test_body_view_follows_the_snakes(greedy_game):
+    game, turns = greedy_game(4, seed=2)
+    snakes = game.snakes
+    pool = SegmentPool(Turtle, max_free=8, discard=lambda seg: None)
+    touched = set()
+
+    def style(seg, index):
+        seg.color(min(index, 3))
+
+    def make(index):
+        seg = pool.acquire()
+        style(seg, index)
+        return seg
+    views = [BodyView(s, make, style, styled=4, release_segment=pool.release, touch=touched.add)
+             for s in snakes]
+    rng = random.Random(9)
+    for tick in range(3000):
+        game.step(turns())
+        if rng.random() < 0.3:
+            continue  # a frame that came late: several moves per sync
+        for view, snake in zip(views, snakes):
+            view.sync()
+            assert [seg.pos for seg in view.turtles] == [to_pixels(c) for c in snake.segments]
+            assert [seg.fill for seg in view.turtles] == [min(i, 3) for i in range(len(snake.segments))]
+            assert all(seg.visible for seg in view.turtles)
+    assert sum(s.resets for s in snakes) > 0  # resets were exercised
+    assert pool.live == sum(len(view.turtles) for view in views)
+    assert pool.reused > 0
+
+
+# A normal tick moves a single turtle (the old tail) for a snake that does not grow.
+def test_body_view_moves_one_turtle_per_tick():
+    game, turns = make_game(50, 1, 300)
+    snake = game.snakes[0]
+    touched = []
+    view = BodyView(snake, lambda index: Turtle(), touch=touched.append)
+    view.sync()
+    for _ in range(20):
+        del touched[:]
+        game.step({snake.name: turns[snake.head]})
+        view.sync()
+        assert len(touched) == 1
+        assert touched[0].pos == to_pixels(snake.segments[0])
+
+
+# A sprite only moves (and reports a move) when its cell changes.
+def test_sprite_moves_only_on_change():
+    moved = []
+    sprite = Sprite(Turtle(), moved.append)
+    assert sprite.place((1, 2)) and sprite.turtle.pos == (20, 40)
+    assert not sprite.place((1, 2)) and not sprite.place(None)
+    assert len(moved) == 1
+
+
+# Released turtles are hidden, parked and reused; beyond ``max_free`` they
+# are discarded.
+def test_segment_pool_reuses_and_caps():
+    discarded = []
+    pool = SegmentPool(Turtle, max_free=1, discard=discarded.append)
+    a, b = pool.acquire(), pool.acquire()
+    pool.release(a)
+    pool.release(b)
+    assert not a.visible and a.pos == OFFSCREEN
+    assert discarded == [b]
+    assert pool.acquire() is a and a.visible
+    assert pool.stats() == {"allocated": 2, "reused": 1, "live": 1, "free": 0, "discarded": 1}
+
+
+# On a big board only the body cells around the camera get a turtle, with
+# the right snake's mark, and turtles of cells that left the view are given back.
+def test_board_view_culls_to_the_camera():
+    game, turns = make_game(1000, 2, 1010)
+    live = set()
+
+    def make(mark):
+        seg = Turtle()
+        seg.mark = mark
+        live.add(seg)
+        return seg
+    radius = 6
+    view = BoardView(Screen(), game, radius, make, live.discard)
+    for _ in range(400):
+        game.step({s.name: turns[s.head] for s in game.snakes})
+        view.camera = game.snakes[0].head
+        view.sync()
+        cx, cy = view.camera
+        want = {(to_pixels(c), s.mark) for s in game.snakes for c in s.segments
+                if abs(c[0] - cx) <= radius and abs(c[1] - cy) <= radius}
+        assert {(seg.pos, mark) for seg, mark in view.tiles.values()} == want
+        assert all(seg.mark == mark for seg, mark in view.tiles.values())
+        assert live == {seg for seg, _ in view.tiles.values()}
+
+
+# After the first full update, frames redraw only the touched turtles; a
+# screen without turtle's internals gets a full update instead.
+def test_frame_renderer_redraws_touched_turtles():
+    drawn = []
+    a, b = DrawnTurtle(drawn), DrawnTurtle(drawn)
+    screen = FrameScreen()
+    frames = FrameRenderer(screen)
+    frames.frame(budget=1.0)
+    assert screen.updates == 1
+    frames.touch(a)
+    frames.frame(lambda: frames.touch(a), budget=1.0)
+    assert drawn == [a] and screen.updates == 1 and screen._tracing == 0
+    assert screen.canvas.repaints == 1
+    bare = FrameScreen(internals=False)
+    frames = FrameRenderer(bare)
+    frames.frame()
+    frames.frame(lambda: frames.touch(b))
+    assert bare.updates == 2 and not drawn[1:]
+    assert frames.stats()["frames"] == 2 and frames.stats()["over_budget"] == 0
+
+
+# The tail gradient gives every segment the color the multiplayer game
+# used to compute per segment: the base color scaled by 180 + min(75, 6 * i).
+@pytest.mark.parametrize("base_rgb", [(30, 30, 30), (30, 144, 255), (255, 255, 255), (0, 200, 7)])
+def test_gradient_matches_the_old_formula(base_rgb):
+    colors = gradient(base_rgb)
+    assert len(colors) == 14  # constant from segment 13 on
+    for index in range(40):
+        scale = 180 + min(75, index * 6)
+        old = tuple(min(255, int(c * scale / 255)) for c in base_rgb)
+        assert colors[min(index, len(colors) - 1)] == "#{:02x}{:02x}{:02x}".format(*old)
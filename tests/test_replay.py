@@ -0,0 +1,89 @@
+"""snake.replay: recordings, deterministic replays and seeking."""
+import os
+
+import pytest
+
+from snake import replay as replays
+
+
+# Record ``ticks`` ticks of a greedy game with ``count`` snakes to ``path``,
+# every snake starting from high score ``high``; returns the finished game.
+# With ``known_seed`` False the recorder is not told the seed (a resumed game).
+@pytest.fixture
+def record(greedy_game):
+    def play(path, count=2, ticks=1500, seed=11, high=0, known_seed=True):
+        game, turns = greedy_game(count, seed, place_food=False)
+        for snake in game.snakes:
+            snake.high_score = high
+        recorder = replays.Recorder(str(path), game, seed if known_seed else None)
+        for _ in range(ticks):
+            recorder.step(turns())
+        recorder.close()
+        return game
+    return play
+
+
+# Cells, scores and food of ``game`` (what a replay has to reproduce).
+def state(game):
+    return game.tick, game.food, [(s.head, list(s.segments), s.score, s.high_score) for s in game.snakes]
+
+
+# Replaying a recording ends in exactly the live game's state.
+def test_replay_matches_live_play(record, tmp_path):
+    live = record(tmp_path / "game.snkr")
+    replay = replays.Replay(str(tmp_path / "game.snkr"))
+    while not replay.done():
+        replay.step()
+    assert state(replay.game) == state(live)
+
+
+# A game of unknown seed, recorded from tick 0, is replayed from its snapshot.
+def test_replay_without_seed_matches_live_play(record, tmp_path):
+    live = record(tmp_path / "game.snkr", known_seed=False)
+    replay = replays.Replay(str(tmp_path / "game.snkr"))
+    assert state(replay.run()) == state(live)
+
+
+# Stored high scores are part of the recording, so "high" events match too.
+def test_replay_keeps_starting_high_scores(record, tmp_path):
+    live = record(tmp_path / "game.snkr", high=7)
+    replay = replays.Replay(str(tmp_path / "game.snkr"))
+    assert [s.high_score for s in replay.game.snakes] == [7, 7]
+    assert state(replay.run()) == state(live)
+
+
+# Empty, truncated and garbled files are rejected with ValueError.
+@pytest.mark.parametrize("data", [b"", b"SNKR", b"SNKR\x01\x00\x00\x00" + bytes(4) + b"\x10\x00\x00\x00{not json",
+                                  b"SNKR\x01\x00\x00\x00" + bytes(4) + b"\x02\x00\x00\x00\xff\xfe",
+                                  b"RIFF" + bytes(12)])
+def test_bad_recordings_raise_value_error(tmp_path, data):
+    path = tmp_path / "bad.snkr"
+    path.write_bytes(data)
+    with pytest.raises(ValueError, match="not a version 1 snake recording"):
+        replays.Replay(str(path))
+
+
+# Seeking back and forth lands on the same state as playing up to that tick.
+def test_seek_is_deterministic(record, tmp_path):
+    record(tmp_path / "game.snkr")
+    straight = replays.Replay(str(tmp_path / "game.snkr"))
+    expected = {}
+    while not straight.done():
+        straight.step()
+        if straight.game.tick in (1, 499, 500, 777, 1400):
+            expected[straight.game.tick] = state(straight.game)
+    seeker = replays.Replay(str(tmp_path / "game.snkr"), snapshot_every=100)
+    for tick in (1400, 777, 1, 500, 499, 1400):
+        seeker.seek(tick)
+        assert state(seeker.game) == expected[tick]
+
+
+# Only the newest recordings are kept.
+def test_prune_keeps_the_newest(tmp_path):
+    for i in range(6):
+        path = tmp_path / "r{}.snkr".format(i)
+        path.write_bytes(b"")
+        os.utime(str(path), (1000 + i, 1000 + i))
+    (tmp_path / "notes.txt").write_text("kept")
+    replays.prune_recordings(str(tmp_path), 2)
+    assert sorted(os.listdir(str(tmp_path))) == ["notes.txt", "r4.snkr", "r5.snkr"]
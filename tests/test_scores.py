@@ -0,0 +1,64 @@
+"""snake.scores: atomic high-score files and the batching HighScoreStore."""
+import json
+import os
+import stat
+
+import pytest
+
+from snake import scores
+
+
+# Mode bits of the file at ``path``.
+def mode(path):
+    return stat.S_IMODE(os.stat(str(path)).st_mode)
+
+
+# Updates stay in memory until a flush, which writes them all at once.
+def test_updates_are_batched(tmp_path):
+    path = tmp_path / "highs.json"
+    store = scores.HighScoreStore(str(path), interval=None)
+    assert store.update("A", 3) and store.update("A", 5) and store.update("B", 1)
+    assert not store.update("A", 4)  # not a new best
+    assert not path.exists() and store.writes == 0
+    store.flush()
+    store.flush()  # nothing new: no second write
+    assert store.writes == 1
+    assert json.loads(path.read_text()) == {"A": 5, "B": 1}
+    assert scores.HighScoreStore(str(path), interval=None).get("A") == 5
+
+
+# ``close`` stops the background writer and writes what it had not yet.
+def test_close_drains_the_writer(tmp_path):
+    path = tmp_path / "highs.json"
+    store = scores.HighScoreStore(str(path), interval=3600)
+    store.update("A", 7)
+    store.close()
+    assert store._thread is None
+    assert json.loads(path.read_text()) == {"A": 7}
+    assert store.writes == 1
+
+
+# A save that fails part-way leaves the old file whole and no temp file behind.
+def test_failed_save_keeps_the_old_file(tmp_path, monkeypatch):
+    path = tmp_path / "highs.json"
+    assert scores.save_highscores({"A": 1}, str(path))
+
+    def broken_dump(data, f):
+        f.write('{"A": ')
+        raise OSError("disk full")
+    monkeypatch.setattr(scores.json, "dump", broken_dump)
+    assert not scores.save_highscores({"A": 2}, str(path))
+    assert json.loads(path.read_text()) == {"A": 1}
+    assert os.listdir(str(tmp_path)) == ["highs.json"]
+
+
+# Saving keeps the permissions of the file it replaces; a first save gets
+# the umask's usual ones rather than mkstemp's owner-only mode.
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permission bits")
+def test_save_keeps_permissions(tmp_path):
+    path = tmp_path / "highs.json"
+    assert scores.save_highscores({"A": 1}, str(path))
+    assert mode(path) == 0o666 & ~scores._UMASK
+    os.chmod(str(path), 0o640)
+    assert scores.save_highscores({"A": 2}, str(path))
+    assert mode(path) == 0o640
@@ -0,0 +1,80 @@
+"""snake.server without sockets: the connection handler and client queues."""
+import asyncio
+import json
+
+from snake.server import Client, ClientState, Room, Server, encode
+
+
+class Writer:
+    """Collects what the server writes."""
+
+    def __init__(self):
+        self.lines = []
+        self.closed = False
+
+    def write(self, data):
+        self.lines.append(data)
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+# Bad input (JSON that is not an object, a line over the reader's limit) is
+# skipped and the connection carries on to a normal join.
+def test_handle_skips_bad_messages():
+    async def run():
+        reader = asyncio.StreamReader(limit=1024)
+        reader.feed_data(b"[1,2]\n\"op\"\nnot json\n")
+        reader.feed_data(b"x" * 5000 + b"\n")
+        reader.feed_data(encode({"op": "join", "room": "r"}))
+        writer = Writer()
+        server = Server()
+        task = asyncio.ensure_future(server.handle(reader, writer))
+        await asyncio.sleep(0.05)
+        joined = "r" in server.rooms
+        reader.feed_eof()
+        await task
+        return joined, writer
+    joined, writer = asyncio.run(run())
+    assert joined
+    assert json.loads(writer.lines[0])["op"] == "state"
+
+
+# A client that lagged a few times but then kept up is not disconnected later.
+def test_resyncs_are_forgiven():
+    async def run():
+        client = Client(Writer(), max_queue=2, max_resyncs=1, forgive=4)
+        for _ in range(3):
+            client.send(b"x")  # third one overflows
+        client._queue.clear()
+        for _ in range(4):
+            client.send(b"x")
+            client._queue.clear()
+        for _ in range(3):
+            client.send(b"x")  # overflows again: first resync since keeping up
+        return client
+    client = asyncio.run(run())
+    assert not client.closed
+    assert client.resyncs == 1
+
+
+# A client rebuilds the bodies exactly from the state and tick deltas.
+def test_client_state_follows_the_room():
+    async def run():
+        room = Room("r", seed=3)
+        room.game.food = room.game.place_food()
+        state = ClientState()
+        state.apply(room.state())
+        for t in range(300):
+            if t % 7 == 0:
+                for name, queue in room.inputs.items():
+                    queue.press(("up", "left", "down", "right")[t // 7 % 4])
+            state.apply(json.loads(room.step()))
+        return room, state
+    room, state = asyncio.run(run())
+    assert state.tick == room.game.tick
+    assert state.heads == [s.head for s in room.game.snakes]
+    assert [list(b) for b in state.bodies] == [list(s.segments) for s in room.game.snakes]
@@ -0,0 +1,72 @@
+"""snake.snapshot: binary save/restore of whole games."""
+import struct
+
+import pytest
+
+from snake import snapshot
+
+
+# A game with ``count`` greedy snakes played for ``ticks`` ticks.
+@pytest.fixture
+def played(greedy_game):
+    def play(count, ticks, seed=7):
+        game, turns = greedy_game(count, seed)
+        for _ in range(ticks):
+            game.step(turns())
+        return game
+    return play
+
+
+# Step a game ``ticks`` times with greedy bots seeded afresh; returns every event.
+@pytest.fixture
+def future(greedy_turns):
+    def run(game, ticks):
+        turns = greedy_turns(game, 100)
+        return [game.step(turns()) for _ in range(ticks)]
+    return run
+
+
+# A loaded snapshot is the same game: same bytes and the same future.
+@pytest.mark.parametrize("count", [1, 2, 5])
+def test_round_trip_keeps_the_future(played, future, count):
+    game = played(count, 500)
+    data = snapshot.dumps(game)
+    copy = snapshot.loads(data)
+    assert snapshot.dumps(copy) == data
+    assert future(copy, 1000) == future(game, 1000)
+    assert snapshot.dumps(copy) == snapshot.dumps(game)
+
+
+# ``restore`` overwrites a game in place; a different game is refused.
+def test_restore_in_place(played):
+    game = played(2, 300)
+    data = snapshot.dumps(game)
+    other = played(2, 50, seed=1)
+    snapshot.restore(other, data)
+    assert snapshot.dumps(other) == data
+    with pytest.raises(ValueError):
+        snapshot.restore(played(1, 0), data)
+
+
+# Truncated, garbled or foreign data raises ValueError, never struct.error.
+def test_bad_data_raises_value_error(played):
+    data = snapshot.dumps(played(2, 200))
+    for bad in (b"", b"nope", data[:5], data[:40], data[:len(data) // 2], data[:-1],
+                data[:4] + b"\x09" + data[5:]):
+        with pytest.raises(ValueError):
+            snapshot.loads(bad)
+
+
+# Grid arrays are stored little-endian whatever the host.
+def test_grid_is_little_endian(played):
+    game = played(2, 200)
+    slot = game.grid.slot
+    assert snapshot.dumps(game).endswith(struct.pack("<{}i".format(len(slot)), *slot))
+
+
+# The byte-swapping path taken on big-endian hosts reads what it writes.
+def test_byte_swapped_round_trip(played, monkeypatch):
+    game = played(2, 200)
+    monkeypatch.setattr(snapshot, "BIG_ENDIAN", not snapshot.BIG_ENDIAN)
+    data = snapshot.dumps(game)
+    assert snapshot.dumps(snapshot.loads(data)) == data
@@ -0,0 +1,17 @@
+"""snake.stats.percentiles."""
+from snake.stats import percentiles
+
+
+# Nearest-rank p50/p99 over unsorted values, scaled.
+def test_percentiles():
+    summary = percentiles([v / 1000.0 for v in range(100, 0, -1)], 1000.0)
+    assert summary["count"] == 100
+    assert summary["p50"] == 51.0
+    assert summary["p99"] == 100.0
+    assert summary["max"] == 100.0
+    assert abs(summary["mean"] - 50.5) < 1e-9
+
+
+# No values: every entry is zero.
+def test_percentiles_empty():
+    assert percentiles([]) == {"count": 0, "mean": 0.0, "p50": 0.0, "p99": 0.0, "max": 0.0}
@@ -0,0 +1,101 @@
+"""snake.telemetry: records from engine steps, the bounded queue, sinks and totals."""
+import json
+import os
+
+from snake.engine import Game, Snake
+from snake.telemetry import Aggregator, JsonLinesSink, Telemetry
+
+
+class ListSink:
+    """Sink keeping every record it is given."""
+
+    def __init__(self):
+        self.records = []
+        self.closed = False
+
+    def write(self, records):
+        self.records.extend(records)
+
+    def close(self):
+        self.closed = True
+
+
+# Telemetry into a ListSink whose writer never wakes up on its own.
+def telemetry(size=4096):
+    sink = ListSink()
+    return Telemetry([sink], size=size, interval=3600), sink
+
+
+# Records of ``kind`` among ``records``.
+def of_kind(records, kind):
+    return [r for r in records if r["kind"] == kind]
+
+
+# Food and death records carry the score the step reached, also for a snake
+# that eats and dies on the same tick (its score is already reset then).
+def test_records_carry_this_ticks_score():
+    snake = Snake("A", (0, 0), "right")
+    game = Game([snake], food=(1, 0))
+    tel, sink = telemetry()
+    step = tel.wrap_step(game, game.step)
+    for _ in range(game.half):  # eat at (1, 0), then run to the border cell
+        step()
+    game.food = snake.head  # food on the border cell: eat, then hit the border
+    step()
+    tel.close()
+    assert [r["score"] for r in of_kind(sink.records, "food")] == [10, 20]
+    death, = of_kind(sink.records, "death")
+    assert (death["cause"], death["score"], death["length"]) == ("border", 20, 2)
+    assert sink.closed
+
+
+# A full queue drops new records and counts them instead of blocking.
+def test_full_queue_drops_records():
+    tel, sink = telemetry(size=3)
+    for tick in range(5):
+        tel.emit("tick", tick, ms=1.0)
+    assert (tel.emitted, tel.dropped) == (3, 2)
+    tel.flush()
+    assert [r["tick"] for r in sink.records] == [0, 1, 2]
+    tel.emit("tick", 5, ms=1.0)  # room again after a flush
+    tel.close()
+    assert [r["tick"] for r in sink.records] == [0, 1, 2, 5]
+
+
+# The JSON-lines file is rotated before it grows past max_bytes, keeping
+# ``backups`` older files; every line stays a whole record.
+def test_json_lines_rotation(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    sink = JsonLinesSink(path, max_bytes=200, backups=2)
+    for tick in range(40):
+        sink.write([{"kind": "tick", "tick": tick, "ms": 1.5}])
+    sink.close()
+    assert sink.rotations > 2
+    assert sorted(os.listdir(str(tmp_path))) == ["events.jsonl", "events.jsonl.1", "events.jsonl.2"]
+    ticks = []
+    for name in ("events.jsonl.2", "events.jsonl.1", "events.jsonl"):
+        with open(str(tmp_path / name), encoding="utf-8") as f:
+            assert os.path.getsize(f.name) <= 200
+            ticks += [json.loads(line)["tick"] for line in f]
+    assert ticks == list(range(40 - len(ticks), 40))
+
+
+# The aggregator's summary counts records, food, deaths by cause and the
+# longest snake, with tick duration percentiles.
+def test_aggregator_summary():
+    totals = Aggregator()
+    totals.write([{"kind": "tick", "ms": ms} for ms in (1.0, 2.0, 3.0, 4.0)])
+    totals.write([{"kind": "food", "player": "A"}, {"kind": "grow", "player": "A", "length": 2},
+                  {"kind": "food", "player": "A"}, {"kind": "grow", "player": "A", "length": 3},
+                  {"kind": "death", "player": "A", "cause": "self"},
+                  {"kind": "death", "player": "B", "cause": "border"},
+                  {"kind": "death", "player": "B", "cause": "border"},
+                  {"kind": "speed", "delay": 0.09}])
+    summary = totals.summary()
+    assert summary["records"] == {"tick": 4, "food": 2, "grow": 2, "death": 3, "speed": 1}
+    assert summary["players"] == {"A": {"food": 2, "deaths": {"self": 1}, "max_length": 3},
+                                  "B": {"food": 0, "deaths": {"border": 2}, "max_length": 1}}
+    assert summary["delay"] == 0.09
+    assert summary["tick_ms"]["max"] == 4.0
+    assert 2.0 <= summary["tick_ms"]["p50"] <= 3.0
+    json.dumps(summary)  # JSON-ready
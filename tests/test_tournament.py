@@ -0,0 +1,44 @@
+"""Seeded headless matches from snake.tournament."""
+import random
+import time
+
+from snake.ai import PathBot
+from snake.engine import Game, Snake
+from snake.tournament import play_match
+
+
+# The same seed replays the same match.
+def test_same_seed_same_match():
+    assert play_match(3, ["greedy", "greedy"], ticks=300) == play_match(3, ["greedy", "greedy"], ticks=300)
+
+
+# Different seeds open differently, so the matches differ (they used to be
+# identical head-to-head crashes over the fixed first food).
+def test_seeds_give_different_matches():
+    results = [play_match(seed, ["greedy", "greedy"], ticks=300) for seed in range(4)]
+    players = [result["players"] for result in results]
+    assert any(p != players[0] for p in players[1:])
+    assert any(player["food"] for p in players for player in p)
+
+
+# A path bot with a cell budget makes the same moves however slow the clock
+# says it is (a time budget would cut its searches short).
+def test_cell_budget_ignores_the_clock():
+    def moves(clock):
+        snake = Snake("S1", (0, 0))
+        game = Game([snake], playfield=2010, seed=7)
+        game.food = game.place_food()
+        bot = PathBot(random.Random(1), clock=clock, cells=64)
+        chosen = []
+        for _ in range(300):
+            chosen.append(bot.choose(game, snake))
+            game.step({snake.name: chosen[-1]})
+        return chosen
+
+    slow = iter(range(10 ** 9))  # a second passes on every reading
+    assert moves(lambda: next(slow)) == moves(time.perf_counter)
+
+
+# Matches with path bots replay exactly.
+def test_path_matches_repeat():
+    assert play_match(5, ["path", "path"], ticks=300) == play_match(5, ["path", "path"], ticks=300)
@@ -0,0 +1,54 @@
+"""snake.vec against snake.engine: the batch simulator follows the same rules."""
+import random
+
+import pytest
+
+from snake.ai import GreedyBot
+from snake.engine import Game, Snake
+
+np = pytest.importorskip("numpy")
+from snake.vec import VecSnake  # noqa: E402  (needs NumPy)
+
+ACTIONS = {"up": 0, "down": 1, "left": 2, "right": 3}
+
+
+# Boards with ``players`` snakes stepped side by side with engine games on
+# the same actions (mostly greedy, some random), the food copied over from
+# the engine: heads, scores, body cells and deaths agree every tick.
+@pytest.mark.parametrize("players", [1, 2, 3])
+def test_vec_matches_engine(players, boards=4, ticks=800):
+    starts = [(-5, 0), (5, 0), (0, -7)][:players]
+    env = VecSnake(boards, starts=starts, seed=1)
+    games = [Game([Snake("S{}".format(q), start) for q, start in enumerate(starts)], seed=i)
+             for i in range(boards)]
+    bot, rng, h = GreedyBot(random.Random(1)), random.Random(2), env.half
+    deaths = 0
+    for _ in range(ticks):
+        actions = np.zeros((boards, players), dtype=int)
+        events = []
+        for i, game in enumerate(games):
+            inputs = {}
+            for q, snake in enumerate(game.snakes):
+                turn = bot.choose(game, snake)
+                if rng.random() < 0.15:
+                    turn = rng.choice(list(ACTIONS))
+                inputs[snake.name] = turn
+                actions[i, q] = ACTIONS[turn]
+            events.append(game.step(inputs))
+        _, _, done = env.step(actions if players > 1 else actions[:, 0])
+        done = done.reshape(boards, players)
+        for i, game in enumerate(games):
+            if game.food is None:
+                env.fx[i] = -1
+            else:
+                env.fx[i], env.fy[i] = game.food[0] + h, game.food[1] + h
+            for q, snake in enumerate(game.snakes):
+                assert (env.hx[i, q] - h, env.hy[i, q] - h) == snake.head
+                assert env.score[i, q] == snake.score
+            occupied = env._occupied(np.array([i]), env.tick)[0]
+            cells = {(x - h, y - h) for y, x in zip(*np.nonzero(occupied))}
+            assert cells == set().union(*[set(s.segments) for s in game.snakes])
+            dead = {e.player for e in events[i] if e.kind == "death"}
+            assert {game.snakes[q].name for q in range(players) if done[i, q]} == dead
+            deaths += len(dead)
+    assert deaths > 0